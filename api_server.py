@@ -0,0 +1,305 @@
+"""
+FastAPI job service for lead generation with progress streaming
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# Load environment variables before Config reads them
+load_dotenv()
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from budget import RunBudget
+from config import Config
+from deepseek_client import DeepSeekClient
+from real_data_processor import RealDataLeadProcessor
+from scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+class JobRequest(BaseModel):
+    """Parameters of one lead generation job"""
+    industry: str = "Graphics & Signage"
+    max_leads: int = Field(20, ge=1, le=100)
+    stop_at_top_k: bool = False
+    deadline_seconds: float = Field(0, ge=0)
+    max_tokens: int = Field(0, ge=0)
+    max_requests: int = Field(0, ge=0)
+    resume_job_id: Optional[str] = None  # pick up an earlier job's unfinished run instead of starting fresh
+
+    def dedup_key(self) -> str:
+        """Identical requests share a key, however the industry is cased or padded"""
+        params = self.model_dump()
+        params['industry'] = params['industry'].strip().lower()
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+class Job:
+    """State and event log of one lead generation run"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, job_id: str, request: JobRequest, key: str):
+        self.id = job_id
+        self.request = request
+        self.key = key
+        self.status = self.QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.leads: List[Dict] = []
+        self.top_leads: List[Dict] = []
+        self.events: List[Dict] = []
+        self.usage: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (self.COMPLETED, self.FAILED)
+
+    @property
+    def changed(self) -> asyncio.Event:
+        """Event set on the next publish; grab it before reading the event log"""
+        return self._changed
+
+    def publish(self, event_type: str, data: Dict):
+        """Append to the event log and wake every subscriber"""
+        self.events.append({'seq': len(self.events), 'type': event_type, 'data': data, 'time': time.time()})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def to_dict(self, include_leads: bool = True) -> Dict:
+        job = {
+            'job_id': self.id,
+            'status': self.status,
+            'request': self.request.model_dump(),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'lead_count': len(self.leads),
+            'events': len(self.events),
+            'error': self.error
+        }
+        if include_leads:
+            job['leads'] = self.leads
+            job['top_leads'] = self.top_leads
+            job['usage'] = self.usage
+        return job
+
+class JobManager:
+    """Runs jobs on one warm processor, deduplicating identical in-flight requests"""
+
+    def __init__(self, processor: RealDataLeadProcessor, max_concurrent_jobs: int = 2, history_size: int = 100):
+        self.processor = processor
+        self.history_size = history_size
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, str] = {}  # dedup key -> job ID of a queued or running job
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrent_jobs))
+
+        # Metrics
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def submit(self, request: JobRequest) -> Tuple[Job, bool]:
+        """Start a job, or return the identical one already queued or running"""
+        self.submitted += 1
+        key = request.dedup_key()
+
+        if key in self._active:
+            self.deduplicated += 1
+            return self.jobs[self._active[key]], True
+
+        job = Job(uuid.uuid4().hex, request, key)
+        self.jobs[job.id] = job
+        self._active[key] = job.id
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: Job):
+        request = job.request
+        try:
+            async with self._semaphore:
+                job.status = Job.RUNNING
+                job.started_at = time.time()
+                job.publish('status', {'status': job.status})
+
+                def on_lead(lead: Dict):
+                    job.leads.append(lead)
+                    job.publish('lead', lead)
+
+                def on_top_k(leads: List[Dict]):
+                    job.top_leads = leads
+                    job.publish('top_k', {'companies': [lead.get('company_name') for lead in leads]})
+
+                leads = await self.processor.generate_real_leads(
+                    request.industry,
+                    max_results=request.max_leads,
+                    on_lead=on_lead,
+                    # Each job journals its own run; an earlier one is resumed only on request
+                    run_id=f"job-{request.resume_job_id or job.id}",
+                    on_top_k=on_top_k,
+                    stop_at_top_k=request.stop_at_top_k,
+                    budget=RunBudget(request.deadline_seconds, request.max_tokens, request.max_requests),
+                    on_progress=lambda stage, info: job.publish('progress', {'stage': stage, **info}),
+                    raise_on_error=True
+                )
+
+                # Partial leads from a run cut short by its budget were never published
+                published = {id(lead) for lead in job.leads}
+                for lead in leads:
+                    if id(lead) not in published:
+                        job.publish('lead', lead)
+                job.leads = leads
+                job.usage = self.processor.deepseek_client.usage.summary()
+                job.status = Job.COMPLETED
+
+        except asyncio.CancelledError:
+            job.status = Job.FAILED
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            job.status = Job.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._active.pop(job.key, None)
+            self._tasks.pop(job.id, None)
+            job.publish('done', {'status': job.status, 'lead_count': len(job.leads), 'error': job.error})
+            self._prune()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the history size"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            del self.jobs[job_id]
+
+    async def shutdown(self):
+        """Cancel every queued or running job"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        statuses = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {'submitted': self.submitted, 'deduplicated': self.deduplicated, 'jobs': statuses}
+
+async def _event_stream(job: Job, request: Request, start: int = 0) -> AsyncIterator[str]:
+    """Replay a job's event log from `start`, then follow it until the job is done"""
+    index = start
+    while True:
+        changed = job.changed
+        while index < len(job.events):
+            event = job.events[index]
+            index += 1
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+        if job.done or await request.is_disconnected():
+            return
+
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=15)
+        except asyncio.TimeoutError:
+            # Keep proxies from closing an idle stream
+            yield ": keep-alive\n\n"
+
+def create_app(config: Optional[Config] = None, base_url: str = "https://openrouter.ai/api/v1") -> FastAPI:
+    """Build the job service around one shared scraper, LLM client and processor"""
+    config = config or Config()
+    state = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Refuse to start rather than accept jobs that can only fail
+        config.validate_config()
+        scraper = WebScraper(config)
+        deepseek_client = DeepSeekClient(config.deepseek_api_key, base_url=base_url, config=config)
+        processor = RealDataLeadProcessor(scraper, deepseek_client, config)
+        state['client'] = deepseek_client
+        state['manager'] = JobManager(processor, config.api_max_concurrent_jobs, config.api_job_history)
+        try:
+            yield
+        finally:
+            await state['manager'].shutdown()
+            await scraper.close()
+            await deepseek_client.close()
+
+    app = FastAPI(title="DuPont Tedlar Lead Generation Jobs", lifespan=lifespan)
+
+    def get_job(job_id: str) -> Job:
+        job = state['manager'].get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def create_job(job_request: JobRequest):
+        resumed = state['manager'].get(job_request.resume_job_id) if job_request.resume_job_id else None
+        if resumed and not resumed.done:
+            raise HTTPException(status_code=409, detail="Job to resume is still running")
+        job, deduplicated = state['manager'].submit(job_request)
+        return {'job_id': job.id, 'status': job.status, 'deduplicated': deduplicated}
+
+    @app.get("/jobs")
+    async def list_jobs():
+        return [job.to_dict(include_leads=False) for job in state['manager'].jobs.values()]
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str):
+        return JSONResponse(json.loads(json.dumps(get_job(job_id).to_dict(), default=str)))
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, request: Request):
+        job = get_job(job_id)
+        # Reconnecting EventSource clients resume after the last event they saw
+        last_event_id = request.headers.get('last-event-id', '')
+        start = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+        return StreamingResponse(
+            _event_stream(job, request, start),
+            media_type="text/event-stream",
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @app.get("/health")
+    async def health():
+        return {'jobs': state['manager'].stats(), 'client': state['client'].stats()}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Lead generation job service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--base-url", default="https://openrouter.ai/api/v1", help="OpenRouter-compatible API base URL")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(create_app(base_url=args.base_url), host=args.host, port=args.port, log_level="info")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark the single-pass page extractor against the BeautifulSoup find_all scans it replaced
+
+Usage: python benchmarks/extract_benchmark.py [--corpus DIR] [--repeat N]
+
+The corpus is every *.html file in DIR (default: benchmarks/pages). Save real
+homepages, LinkedIn pages and exhibitor directories there to benchmark on them.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_extractor import best_match, extract_page_facts
+
+LEGACY_REVENUE_PATTERNS = [
+    r'\$\d+(?:\.\d+)?\s*(?:million|billion)?\s*(?:in\s*)?revenue',
+    r'revenue.*?\$?\d+(?:\.\d+)?\s*(?:million|billion)',
+    r'\d+(?:\.\d+)?\s*(?:million|billion).*(?:revenue|annual)',
+]
+
+LEGACY_EMPLOYEE_PATTERNS = [
+    r'(\d+(?:,\d+)*)\s*employees?',
+    r'employs?\s*(\d+(?:,\d+)*)',
+    r'(\d+(?:,\d+)*)\s*people',
+]
+
+def legacy_extract(html: str) -> Dict:
+    """The overview + LinkedIn extraction as WebScraper did it before page_extractor"""
+    soup = BeautifulSoup(html, 'lxml')
+    data = {}
+
+    for pattern in LEGACY_REVENUE_PATTERNS:
+        matches = soup.find_all(string=re.compile(pattern, re.IGNORECASE))
+        if matches:
+            data['revenue_text'] = matches[0].strip()
+            break
+
+    for pattern in LEGACY_EMPLOYEE_PATTERNS:
+        matches = soup.find_all(string=re.compile(pattern, re.IGNORECASE))
+        if matches:
+            data['employees_text'] = matches[0].strip()
+            break
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    if meta_desc:
+        data['description'] = meta_desc.get('content', '')[:500]
+
+    # _scrape_linkedin parsed the page a second time
+    soup = BeautifulSoup(html, 'lxml')
+    size_match = soup.find(string=re.compile(LEGACY_EMPLOYEE_PATTERNS[0], re.IGNORECASE))
+    if size_match:
+        data['employees_linkedin'] = size_match.strip()
+
+    return data
+
+def single_pass_extract(html: str) -> Dict:
+    """The same fields from one extract_page_facts call"""
+    facts = extract_page_facts(html)
+    data = {}
+
+    revenue = best_match(facts['revenue'])
+    if revenue:
+        data['revenue_text'] = revenue['text']
+    employees = best_match(facts['employees'])
+    if employees:
+        data['employees_text'] = employees['text']
+    if facts['description']:
+        data['description'] = facts['description']
+    size_match = best_match(facts['employees'], patterns=[0])
+    if size_match:
+        data['employees_linkedin'] = size_match['text']
+
+    return data
+
+def time_per_page(extract, html: str, repeat: int) -> float:
+    """Best-of-three mean seconds per call"""
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            extract(html)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages"))
+    parser.add_argument("--repeat", type=int, default=20, help="Extractions per page per timing round")
+    args = parser.parse_args(argv)
+
+    pages = sorted(name for name in os.listdir(args.corpus) if name.endswith('.html'))
+    if not pages:
+        print(f"No .html pages in {args.corpus}")
+        return 1
+
+    print(f"{'page':<28}{'KB':>8}{'legacy ms':>12}{'single ms':>12}{'speedup':>10}  fields")
+    legacy_total = single_total = 0.0
+    for name in pages:
+        with open(os.path.join(args.corpus, name), encoding='utf-8', errors='replace') as f:
+            html = f.read()
+
+        legacy = legacy_extract(html)
+        single = single_pass_extract(html)
+        # Legacy scans also matched <script>, <style> and comment text, which visitors never see
+        differing = sorted(key for key in set(legacy) | set(single) if legacy.get(key) != single.get(key))
+
+        legacy_time = time_per_page(legacy_extract, html, args.repeat)
+        single_time = time_per_page(single_pass_extract, html, args.repeat)
+        legacy_total += legacy_time
+        single_total += single_time
+
+        fields = "same" if not differing else "differ: " + ", ".join(differing)
+        print(f"{name:<28}{len(html) / 1024:>8.1f}{legacy_time * 1000:>12.2f}{single_time * 1000:>12.2f}"
+              f"{legacy_time / single_time:>9.1f}x  {fields}")
+
+    print(f"{'total':<36}{legacy_total * 1000:>12.2f}{single_total * 1000:>12.2f}{legacy_total / single_total:>9.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
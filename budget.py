@@ -0,0 +1,114 @@
+"""
+Run-level time, token and request budgets shared by every scraper and LLM call
+"""
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class BudgetExceeded(Exception):
+    """Raised when a call would go over the active run budget"""
+    pass
+
+_current_budget: ContextVar[Optional["RunBudget"]] = ContextVar("run_budget", default=None)
+
+def current_budget() -> Optional["RunBudget"]:
+    """The budget of the run the calling task belongs to, if any"""
+    return _current_budget.get()
+
+class RunBudget:
+    """Wall-clock deadline, token cap and HTTP request cap for one pipeline run
+
+    A limit of 0 means unlimited. The budget is bound to the run through a context
+    variable, so tasks spawned by the run see it without it being passed around.
+    """
+
+    def __init__(self, deadline_seconds: float = 0, max_tokens: int = 0, max_requests: int = 0):
+        self.deadline_seconds = deadline_seconds
+        self.max_tokens = max_tokens
+        self.max_requests = max_requests
+        self.started_at = time.monotonic()
+
+        self.tokens_used = 0
+        self.requests_used = 0
+        self.late_charges = 0  # LLM calls that finished after the budget ran out; cancellation should keep this 0
+        self.exhausted_reason: Optional[str] = None
+        self._exhausted = asyncio.Event()
+
+    @property
+    def unlimited(self) -> bool:
+        return not (self.deadline_seconds or self.max_tokens or self.max_requests)
+
+    def activate(self) -> Token:
+        """Bind this budget to the current context and restart its clock"""
+        self.started_at = time.monotonic()
+        return _current_budget.set(self)
+
+    @staticmethod
+    def deactivate(token: Token):
+        _current_budget.reset(token)
+
+    def remaining_time(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without one"""
+        if not self.deadline_seconds:
+            return None
+        return max(0.0, self.deadline_seconds - (time.monotonic() - self.started_at))
+
+    def clamp_timeout(self, timeout: float) -> float:
+        """Shorten a per-request timeout so it cannot outlive the deadline"""
+        remaining = self.remaining_time()
+        if remaining is None:
+            return timeout
+        return max(0.1, min(timeout, remaining))
+
+    def _exhaust(self, reason: str):
+        if not self.exhausted_reason:
+            self.exhausted_reason = reason
+            logger.warning(f"Run budget exhausted: {reason}")
+        self._exhausted.set()
+
+    def check(self):
+        """Raise BudgetExceeded if any limit has been reached"""
+        if not self.exhausted_reason and self.remaining_time() == 0:
+            self._exhaust("deadline")
+        if self.exhausted_reason:
+            raise BudgetExceeded(f"Run budget exhausted: {self.exhausted_reason}")
+
+    def charge_request(self):
+        """Account for one outgoing HTTP request, raising BudgetExceeded if none are left"""
+        self.check()
+        if self.max_requests and self.requests_used >= self.max_requests:
+            self._exhaust("max_requests")
+            self.check()
+        self.requests_used += 1
+
+    def charge_tokens(self, tokens: int):
+        """Account for tokens a completed LLM call used"""
+        if self.exhausted_reason:
+            self.late_charges += 1
+        self.tokens_used += tokens or 0
+        if self.max_tokens and self.tokens_used >= self.max_tokens:
+            self._exhaust("max_tokens")
+
+    async def wait_exhausted(self):
+        """Return once any limit is reached (never, for an unlimited budget)"""
+        try:
+            await asyncio.wait_for(self._exhausted.wait(), timeout=self.remaining_time())
+        except asyncio.TimeoutError:
+            self._exhaust("deadline")
+
+    def stats(self) -> Dict:
+        return {
+            'elapsed': round(time.monotonic() - self.started_at, 2),
+            'deadline_seconds': self.deadline_seconds,
+            'tokens_used': self.tokens_used,
+            'max_tokens': self.max_tokens,
+            'requests_used': self.requests_used,
+            'max_requests': self.max_requests,
+            'late_charges': self.late_charges,
+            'exhausted': self.exhausted_reason
+        }
@@ -0,0 +1,250 @@
+"""
+Headless batch CLI for running lead generation over several industries, or over a list of known companies
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, TextIO
+
+from dotenv import load_dotenv
+
+# Load environment variables before Config reads them
+load_dotenv()
+
+from budget import RunBudget
+from config import Config
+from dashboard import DashboardGenerator
+from deepseek_client import DeepSeekClient
+from lead_processor import LeadProcessor
+from real_data_processor import RealDataLeadProcessor
+from scraper import WebScraper
+
+logger = logging.getLogger(__name__)
+
+# Exit codes
+EXIT_OK = 0  # every industry produced complete leads
+EXIT_FAILED = 1  # no leads at all, or a fatal error
+EXIT_PARTIAL = 3  # some industries produced no leads or only partial ones
+
+class LeadWriter:
+    """Appends leads to a JSONL or CSV stream as soon as they complete"""
+
+    def __init__(self, stream: TextIO, output_format: str = "jsonl"):
+        self.stream = stream
+        self.output_format = output_format
+        self.dashboard = DashboardGenerator()
+        self._csv_writer = None
+        self.written = 0
+
+    def write(self, lead: Dict, search_industry: str):
+        completeness = lead.get('completeness', 1.0)
+
+        if self.output_format == "csv":
+            row = {'Search Industry': search_industry, 'Completeness': completeness,
+                   **self.dashboard.export_row(lead)}
+            if self._csv_writer is None:
+                self._csv_writer = csv.DictWriter(self.stream, fieldnames=list(row.keys()))
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+        else:
+            record = {'search_industry': search_industry, **lead, 'completeness': completeness}
+            self.stream.write(json.dumps(record, default=str) + "\n")
+
+        # Keep the file useful if the batch is killed part-way
+        self.stream.flush()
+        self.written += 1
+
+async def run_industry(processor: RealDataLeadProcessor, industry: str, args: argparse.Namespace,
+                       writer: LeadWriter, semaphore: asyncio.Semaphore) -> Dict:
+    """Generate leads for one industry, streaming each finished lead to the writer"""
+    async with semaphore:
+        logger.info(f"Starting {industry}")
+        written = set()
+
+        def write_lead(lead: Dict):
+            written.add(id(lead))
+            writer.write(lead, industry)
+
+        run_id = None if args.no_resume else f"{args.run_id}|{industry.strip().lower()}|{args.max_leads}"
+        budget = RunBudget(
+            deadline_seconds=args.deadline,
+            max_tokens=args.max_tokens,
+            max_requests=args.max_requests
+        )
+
+        try:
+            leads = await processor.generate_real_leads(
+                industry,
+                max_results=args.max_leads,
+                on_lead=write_lead,
+                run_id=run_id,
+                budget=budget
+            )
+        except Exception as e:
+            logger.error(f"Industry {industry} failed: {str(e)}")
+            leads = []
+
+        # Partial leads returned when the budget ran out were never published
+        for lead in leads:
+            if id(lead) not in written:
+                write_lead(lead)
+
+        usage = processor.deepseek_client.usage.summary()['totals']
+        summary = {
+            'industry': industry,
+            'leads': len(leads),
+            'partial_leads': sum(1 for lead in leads if lead.get('completeness', 1) < 1),
+            'budget': budget.stats(),
+            'llm_calls': usage['calls'],
+            'tokens': usage['total_tokens'],
+            'estimated_cost': usage['estimated_cost']
+        }
+        logger.info(f"Finished {industry}: {summary}")
+        return summary
+
+def exit_code(summaries: List[Dict]) -> int:
+    """Map per-industry results to the process exit code"""
+    if not any(summary['leads'] for summary in summaries):
+        return EXIT_FAILED
+    if any(not summary['leads'] or summary['partial_leads'] for summary in summaries):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+async def run_batch(args: argparse.Namespace, config: Config, stream: TextIO) -> int:
+    """Run every industry concurrently over one shared scraper, LLM client and cache"""
+    scraper = WebScraper(config)
+    deepseek_client = DeepSeekClient(config.deepseek_api_key, base_url=args.base_url, config=config)
+    processor = RealDataLeadProcessor(scraper, deepseek_client, config)
+    writer = LeadWriter(stream, args.format)
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    try:
+        summaries = await asyncio.gather(*[
+            run_industry(processor, industry, args, writer, semaphore)
+            for industry in args.industries
+        ])
+        logger.info(f"Wrote {writer.written} leads - client stats: {deepseek_client.stats()}, "
+                    f"page cache: {scraper.http_cache_stats()}, hosts: {scraper.host_stats()}")
+    finally:
+        await scraper.close()
+        await deepseek_client.close()
+
+    return exit_code(summaries)
+
+def load_companies(path: str) -> List[Dict]:
+    """Companies from a JSON lines file; each needs at least a name and website"""
+    companies = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            company = json.loads(line)
+            if not company.get('name') or not company.get('website'):
+                logger.warning(f"Skipping line {number} of {path}: a company needs a name and website")
+                continue
+            company.setdefault('company_name', company['name'])
+            companies.append(company)
+    return companies
+
+async def run_companies(args: argparse.Namespace, config: Config, stream: TextIO, companies: List[Dict]) -> int:
+    """Stream known companies through the staged lead pipeline, writing each lead as it leaves it"""
+    scraper = WebScraper(config)
+    deepseek_client = DeepSeekClient(config.deepseek_api_key, base_url=args.base_url, config=config)
+    processor = LeadProcessor(scraper, deepseek_client, config)
+    writer = LeadWriter(stream, args.format)
+    budget = RunBudget(
+        deadline_seconds=args.deadline,
+        max_tokens=args.max_tokens,
+        max_requests=args.max_requests
+    )
+    token = budget.activate()
+
+    try:
+        async for lead in processor.stream_leads(companies):
+            writer.write(lead, lead.get('industry', ''))
+        logger.info(f"Wrote {writer.written} leads from {len(companies)} companies - "
+                    f"pipeline: {processor.pipeline_stats}, budget: {budget.stats()}")
+    finally:
+        budget.deactivate(token)
+        await scraper.close()
+        await deepseek_client.close()
+
+    if not writer.written:
+        return EXIT_FAILED
+    # Companies lost to errors, as opposed to ones that did not qualify
+    if any(stage['errors'] for stage in processor.pipeline_stats.values()):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate leads for one or more industries without the Streamlit UI",
+        epilog=f"Exit codes: {EXIT_OK} = all industries produced complete leads, "
+               f"{EXIT_FAILED} = no leads or fatal error, "
+               f"{EXIT_PARTIAL} = some industries empty or cut short by their budget"
+    )
+    parser.add_argument("industries", nargs="*", help="Industries to research (default: Config.target_industries)")
+    parser.add_argument("--industries-file", help="File with one industry per line")
+    parser.add_argument("--companies", help="JSON lines file of known companies (name, website, ...) to qualify "
+                                            "and turn into leads instead of researching industries")
+    parser.add_argument("--max-leads", type=int, default=20, help="Leads per industry")
+    parser.add_argument("--output", "-o", default="-", help="Output file, or - for stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from the file extension)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Industries processed at once")
+    parser.add_argument("--deadline", type=float, default=0, help="Seconds per industry run (0 = no limit)")
+    parser.add_argument("--max-tokens", type=int, default=0, help="LLM tokens per industry run (0 = unlimited)")
+    parser.add_argument("--max-requests", type=int, default=0, help="HTTP requests per industry run (0 = unlimited)")
+    parser.add_argument("--run-id", default=f"batch-{datetime.now():%Y-%m-%d}",
+                        help="Run ID prefix; rerunning with the same prefix resumes unfinished industries")
+    parser.add_argument("--no-resume", action="store_true", help="Do not checkpoint or resume runs")
+    parser.add_argument("--base-url", default="https://openrouter.ai/api/v1", help="OpenRouter-compatible API base URL")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
+
+    if args.industries_file:
+        with open(args.industries_file) as f:
+            args.industries += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if not args.format:
+        args.format = "csv" if args.output.endswith(".csv") else "jsonl"
+
+    return args
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), stream=sys.stderr,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    config = Config()
+    if not config.deepseek_api_key:
+        logger.error("DEEPSEEK_API_KEY is not set")
+        return EXIT_FAILED
+    companies = None
+    if args.companies:
+        try:
+            companies = load_companies(args.companies)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read companies from {args.companies}: {str(e)}")
+            return EXIT_FAILED
+    elif not args.industries:
+        args.industries = list(config.target_industries)
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        if companies is not None:
+            return asyncio.run(run_companies(args, config, stream, companies))
+        return asyncio.run(run_batch(args, config, stream))
+    except KeyboardInterrupt:
+        logger.warning("Interrupted - rerun with the same --run-id to resume")
+        return EXIT_FAILED
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,17 +18,93 @@ class Config:
     # Scraping settings
     scraping_timeout: int = 30
     max_concurrent_scrapes: int = 5
+    max_concurrent_leads: int = 0  # companies processed at once; 0 = min(scrape, LLM concurrency)
     user_agent_rotation: bool = True
+    scrape_sources: list = None  # company data sources fetched concurrently, in merge order
+    scrape_source_timeouts: dict = None  # seconds per source, not counting time queued for a host
+    scrape_per_host_concurrency: int = 2  # requests in flight to any one host
+    scrape_per_host_delay: float = 1.0  # seconds between request starts to one host
+    scrape_host_overrides: dict = None  # {"domain": {"concurrency": n, "delay": s}}, subdomains included
+    scrape_connection_limit: int = 100  # open connections across all hosts
+    scrape_dns_cache_ttl: int = 300  # seconds
+    parse_workers: int = 2  # processes parsing HTML off the event loop; 0 = parse on the loop
+
+    # HTTP cache for scraped pages (revalidated with ETag / Last-Modified once stale)
+    http_cache_enabled: bool = True
+    http_cache_path: str = ".cache/http_cache.sqlite"
+    http_cache_max_bytes: int = 200 * 1024 * 1024  # 200MB, compressed
+    http_cache_ttls: dict = None  # freshness in seconds per domain (subdomains included)
 
     # Data processing
     min_revenue_threshold: float = 100000000  # $100M
+    min_employee_count: int = 0  # 0 = no employee minimum
+    qualifying_keywords: list = None  # name/products/industry must mention one; empty = any
+    excluded_keywords: list = None  # drop companies mentioning any of these
     max_companies_per_event: int = 20
+    discovery_concurrency: int = 3  # events searched for companies at once
     max_decision_makers_per_company: int = 3
+    use_lead_dossier: bool = True  # one structured completion per lead instead of four (two when outreach streams)
+    run_deadline_seconds: float = 0  # wall-clock limit per generate_real_leads run; 0 = none
+    run_max_tokens: int = 0  # LLM tokens per run; 0 = unlimited
+    run_max_requests: int = 0  # scraper + LLM HTTP requests per run; 0 = unlimited
+    lead_top_k: int = 5  # best leads published as soon as they are complete
+    stop_at_top_k: bool = False  # end the run once the top-k can no longer be outranked
 
     # DeepSeek settings
     deepseek_model: str = "deepseek-chat"
     deepseek_temperature: float = 0.7
     deepseek_max_tokens: int = 2000
+    deepseek_prompt_price_per_million: float = 0.30  # USD, estimate - check OpenRouter pricing
+    deepseek_completion_price_per_million: float = 1.20  # USD, estimate - check OpenRouter pricing
+
+    # DeepSeek connection pool (shared httpx.AsyncClient)
+    deepseek_http2: bool = True
+    deepseek_timeout: float = 60.0
+    deepseek_connect_timeout: float = 5.0
+    deepseek_max_connections: int = 100
+    deepseek_max_keepalive_connections: int = 20
+    deepseek_keepalive_expiry: float = 30.0  # seconds
+
+    # OpenRouter rate limits (starting points - adapted from response headers)
+    deepseek_requests_per_minute: int = 60
+    deepseek_tokens_per_minute: int = 200000
+    deepseek_initial_concurrency: int = 4
+    deepseek_max_concurrency: int = 32
+
+    # Retries and circuit breaker for LLM calls
+    llm_max_attempts: int = 4
+    llm_backoff_base: float = 0.5  # seconds
+    llm_backoff_max: float = 20.0  # seconds
+    llm_retry_budget: int = 50  # retries per pipeline run
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_recovery_timeout: float = 30.0  # seconds
+
+    # Batched enrichment (several companies per completion)
+    llm_batch_enrichment: bool = True
+    llm_batch_token_budget: int = 6000  # estimated prompt tokens per batch
+    llm_batch_max_output_tokens: int = 6000
+
+    # LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".cache/llm_responses.sqlite"
+    llm_cache_max_bytes: int = 50 * 1024 * 1024  # 50MB
+    llm_cache_ttls: dict = None  # seconds per call type
+
+    # Company entity resolution (deduplication across events and runs)
+    entity_store_path: str = ".cache/entities.sqlite"  # empty = in-memory only
+    entity_similarity_threshold: float = 0.9
+
+    # Run journal (checkpoints for resuming interrupted runs)
+    run_journal_enabled: bool = True
+    run_journal_path: str = ".cache/run_journal.sqlite"
+
+    # Streaming lead pipeline (LeadProcessor.stream_leads)
+    pipeline_queue_size: int = 10  # items buffered between stages
+    pipeline_stage_concurrency: dict = None  # workers per stage
+
+    # Job service (api_server.py)
+    api_max_concurrent_jobs: int = 2
+    api_job_history: int = 100  # finished jobs kept for status queries
 
     # Dashboard settings
     dashboard_update_interval: int = 300  # 5 minutes
@@ -62,6 +138,62 @@ class Config:
                 "Graphics Industry"
             ]
 
+        if not self.scrape_sources:
+            # Crunchbase blocks anonymous scraping; add "crunchbase" to enable it
+            self.scrape_sources = ["overview", "linkedin"]
+
+        if not self.scrape_source_timeouts:
+            self.scrape_source_timeouts = {
+                "overview": 15.0,
+                "linkedin": 10.0,
+                "crunchbase": 15.0
+            }
+
+        if self.scrape_host_overrides is None:
+            # Every company's LinkedIn page is on one host that bans bursts quickly
+            self.scrape_host_overrides = {
+                "linkedin.com": {"concurrency": 1, "delay": 3.0},
+                "crunchbase.com": {"concurrency": 1, "delay": 3.0}
+            }
+
+        if not self.http_cache_ttls:
+            self.http_cache_ttls = {
+                "linkedin.com": 7 * 86400,
+                "crunchbase.com": 7 * 86400,
+                "default": 3 * 86400
+            }
+
+        if self.qualifying_keywords is None:
+            self.qualifying_keywords = []
+
+        if self.excluded_keywords is None:
+            # Trade bodies and media the AI lists alongside real buyers
+            self.excluded_keywords = [
+                "association",
+                "magazine",
+                "university"
+            ]
+
+        if not self.pipeline_stage_concurrency:
+            self.pipeline_stage_concurrency = {
+                "scrape": self.max_concurrent_scrapes,
+                "enrich": 4,
+                "qualify": 4,
+                "contacts": 4,
+                "outreach": 4
+            }
+
+        if not self.llm_cache_ttls:
+            self.llm_cache_ttls = {
+                "event_research": 7 * 86400,
+                "company_discovery": 7 * 86400,
+                "enrichment": 3 * 86400,
+                "decision_makers": 3 * 86400,
+                "rationale": 86400,
+                "dossier": 86400,
+                "default": 86400
+            }
+
     def validate_config(self) -> bool:
         """Validate that required configuration is present"""
         if not self.deepseek_api_key:
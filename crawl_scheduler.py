@@ -0,0 +1,130 @@
+"""
+Per-host politeness scheduling for scraper requests
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class HostQueue:
+    """FIFO queue of requests to one host, limited in concurrency and spacing"""
+
+    def __init__(self, host: str, concurrency: int, min_delay: float):
+        self.host = host
+        self.min_delay = min_delay
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        self._start_lock = asyncio.Lock()  # requests start in arrival order
+        self.next_start = 0.0
+
+        # Metrics
+        self.requests = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.total_wait = 0.0
+        self.backoffs = 0
+
+    async def acquire(self):
+        """Wait for a free slot, then until min_delay has passed since the previous start"""
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._slots.acquire()
+            try:
+                async with self._start_lock:
+                    delay = self.next_start - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    self.next_start = time.monotonic() + self.min_delay
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.requests += 1
+        self.total_wait += time.monotonic() - queued_at
+
+    def release(self):
+        self._slots.release()
+
+    def back_off(self, seconds: float):
+        """Hold further requests to this host for `seconds` (e.g. after a 429)"""
+        self.backoffs += 1
+        self.next_start = max(self.next_start, time.monotonic() + seconds)
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'waiting': self.waiting,
+            'max_waiting': self.max_waiting,
+            'avg_wait': round(self.total_wait / self.requests, 3) if self.requests else 0.0,
+            'backoffs': self.backoffs
+        }
+
+class CrawlScheduler:
+    """Hands out per-host request slots so no single host sees bursts
+
+    Each host gets its own queue with a concurrency limit and a minimum delay
+    between request starts. Overrides are matched by domain suffix, so
+    "linkedin.com" also covers "www.linkedin.com".
+    """
+
+    def __init__(self, per_host_concurrency: int = 2, min_delay: float = 1.0,
+                 host_overrides: Optional[Dict[str, Dict]] = None, throttle_backoff: float = 30.0):
+        self.per_host_concurrency = per_host_concurrency
+        self.min_delay = min_delay
+        self.host_overrides = host_overrides or {}
+        self.throttle_backoff = throttle_backoff  # pause after a 429/503 without Retry-After
+        self.hosts: Dict[str, HostQueue] = {}
+
+    def _limits(self, host: str) -> Dict:
+        """Concurrency and delay for a host: the most specific override, else the defaults"""
+        override, best_length = {}, -1
+        for domain, limits in self.host_overrides.items():
+            if (host == domain or host.endswith('.' + domain)) and len(domain) > best_length:
+                override, best_length = limits, len(domain)
+        return {'concurrency': self.per_host_concurrency, 'delay': self.min_delay, **override}
+
+    @property
+    def max_host_concurrency(self) -> int:
+        """Highest per-host concurrency any host may get"""
+        return max([self.per_host_concurrency] + [
+            limits.get('concurrency', 0) for limits in self.host_overrides.values()
+        ])
+
+    def queue_for(self, url: str) -> HostQueue:
+        host = (urlparse(url).hostname or '').lower()
+        if host not in self.hosts:
+            limits = self._limits(host)
+            self.hosts[host] = HostQueue(host, limits['concurrency'], limits['delay'])
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the URL's host slots for the duration of a request"""
+        queue = self.queue_for(url)
+        await queue.acquire()
+        try:
+            yield queue
+        finally:
+            queue.release()
+
+    def throttled(self, url: str, retry_after: Optional[str] = None):
+        """Pause a host that answered 429/503, honouring a numeric Retry-After"""
+        try:
+            seconds = float(retry_after) if retry_after else self.throttle_backoff
+        except ValueError:
+            seconds = self.throttle_backoff
+        queue = self.queue_for(url)
+        queue.back_off(seconds)
+        logger.warning(f"Host {queue.host} is throttling - pausing it for {seconds:.0f}s")
+
+    def stats(self) -> Dict:
+        """Per-host request, queueing and back-off counters"""
+        return {host: queue.stats() for host, queue in self.hosts.items()}
@@ -3,14 +3,14 @@ Dashboard generator for lead visualization and reporting
 """
 
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 import pandas as pd
 
 class DashboardGenerator:
     """Generates dashboard data for lead visualization"""
 
-    def create_dashboard(self, leads: List[Dict]) -> Dict:
+    def create_dashboard(self, leads: List[Dict], run_stats: Optional[Dict] = None) -> Dict:
         """Create comprehensive dashboard data"""
         dashboard_data = {
             'summary': self._generate_summary(leads),
@@ -18,7 +18,8 @@ class DashboardGenerator:
             'leads_by_industry': self._group_by_industry(leads),
             'leads_by_revenue': self._group_by_revenue(leads),
             'recent_activity': self._generate_activity_feed(leads),
-            'export_data': self._prepare_export_data(leads)
+            'export_data': self._prepare_export_data(leads),
+            'run_stats': self._summarize_run_stats(run_stats)
         }
 
         return dashboard_data
@@ -135,33 +136,57 @@ class DashboardGenerator:
 
         return activities
 
+    def _summarize_run_stats(self, run_stats: Optional[Dict], top_companies: int = 10) -> Dict:
+        """Format LLM usage stats (UsageTracker.summary) with the slowest stages first"""
+        if not run_stats:
+            return {}
+
+        stages = [
+            {'stage': stage, **data}
+            for stage, data in run_stats.get('stages', {}).items()
+        ]
+        stages.sort(key=lambda x: x.get('latency_total', 0), reverse=True)
+
+        companies = [
+            {'company': company, **data}
+            for company, data in run_stats.get('companies', {}).items()
+        ]
+        companies.sort(key=lambda x: x.get('total_tokens', 0), reverse=True)
+
+        return {
+            'totals': run_stats.get('totals', {}),
+            'wall_clock': run_stats.get('wall_clock', 0),
+            'stages': stages,
+            'top_companies': companies[:top_companies]
+        }
+
     def _prepare_export_data(self, leads: List[Dict]) -> Dict:
         """Prepare data for export to CSV/Excel"""
-        export_data = []
-
-        for lead in leads:
-            export_row = {
-                'Company Name': lead.get('company_name', ''),
-                'Website': lead.get('website', ''),
-                'Estimated Revenue': lead.get('estimated_revenue', 0),
-                'Employees': lead.get('employees', ''),
-                'Industry': lead.get('industry', ''),
-                'Qualification Rationale': lead.get('qualification_rationale', ''),
-                'Primary Contact': lead.get('primary_contact', {}).get('name', ''),
-                'Contact Title': lead.get('primary_contact', {}).get('title', ''),
-                'Contact Email': lead.get('primary_contact', {}).get('email', ''),
-                'LinkedIn URL': lead.get('primary_contact', {}).get('linkedin_url', ''),
-                'Outreach Message': lead.get('outreach_message', ''),
-                'Source Event': ', '.join(lead.get('events_attending', [])),
-                'Generated At': datetime.utcnow().isoformat()
-            }
-            export_data.append(export_row)
+        export_data = [self.export_row(lead) for lead in leads]
 
         return {
             'csv_data': export_data,
             'column_headers': list(export_data[0].keys()) if export_data else []
         }
 
+    def export_row(self, lead: Dict) -> Dict:
+        """Flatten one lead into an export row"""
+        return {
+            'Company Name': lead.get('company_name', ''),
+            'Website': lead.get('website', ''),
+            'Estimated Revenue': lead.get('estimated_revenue', 0),
+            'Employees': lead.get('employees', ''),
+            'Industry': lead.get('industry', ''),
+            'Qualification Rationale': lead.get('qualification_rationale', ''),
+            'Primary Contact': lead.get('primary_contact', {}).get('name', ''),
+            'Contact Title': lead.get('primary_contact', {}).get('title', ''),
+            'Contact Email': lead.get('primary_contact', {}).get('email', ''),
+            'LinkedIn URL': lead.get('primary_contact', {}).get('linkedin_url', ''),
+            'Outreach Message': lead.get('outreach_message', ''),
+            'Source Event': ', '.join(lead.get('events_attending', [])),
+            'Generated At': datetime.utcnow().isoformat()
+        }
+
     def export_to_csv(self, leads: List[Dict], filename: str = 'leads_export.csv'):
         """Export leads to CSV file"""
         export_data = self._prepare_export_data(leads)
@@ -174,7 +199,7 @@ class DashboardGenerator:
 
         return True
 
-    def export_to_excel(self, leads: List[Dict], filename: str = 'leads_export.xlsx'):
+    def export_to_excel(self, leads: List[Dict], filename: str = 'leads_export.xlsx', run_stats: Optional[Dict] = None):
         """Export leads to Excel file"""
         export_data = self._prepare_export_data(leads)
 
@@ -201,4 +226,9 @@ class DashboardGenerator:
             if not industry_df.empty:
                 industry_df.to_excel(writer, sheet_name='By Industry', index=False)
 
+            # LLM usage per stage
+            stats = self._summarize_run_stats(run_stats)
+            if stats.get('stages'):
+                pd.DataFrame(stats['stages']).to_excel(writer, sheet_name='Run Stats', index=False)
+
         return True
@@ -6,63 +6,377 @@ import json
 import logging
 import re
 import httpx
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 import asyncio
+import time
+from contextvars import ContextVar
+from budget import RunBudget, current_budget
+from llm_cache import ResponseCache
+from rate_limiter import AdaptiveRateLimiter, estimate_tokens
+from resilience import CircuitBreaker, ResilienceLayer, RetryBudget, RetryPolicy
+from usage_tracker import UsageTracker
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying; 429 is retried but does not count against the circuit breaker
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# JSON schema for the one-shot lead dossier completion
+LEAD_DOSSIER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "estimated_revenue": {"type": "number", "description": "Estimated annual revenue in US dollars"},
+        "estimated_employees": {"type": "string", "description": "Employee count or range"},
+        "strategic_insights": {"type": "string", "description": "Growth, market position and pain points Tedlar could address"},
+        "qualification_rationale": {"type": "string", "description": "2-3 sentences on why this is a qualified lead"},
+        "decision_makers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "department": {"type": "string"},
+                    "relevance": {"type": "string"}
+                },
+                "required": ["title", "department", "relevance"],
+                "additionalProperties": False
+            }
+        },
+        "outreach_message": {"type": "string", "description": "LinkedIn message under 150 words"}
+    },
+    "required": [
+        "estimated_revenue",
+        "estimated_employees",
+        "strategic_insights",
+        "qualification_rationale",
+        "decision_makers",
+        "outreach_message"
+    ],
+    "additionalProperties": False
+}
+
+# The dossier without its outreach message, for callers that stream the outreach separately
+LEAD_PROFILE_SCHEMA = {
+    **LEAD_DOSSIER_SCHEMA,
+    "properties": {key: value for key, value in LEAD_DOSSIER_SCHEMA["properties"].items() if key != "outreach_message"},
+    "required": [field for field in LEAD_DOSSIER_SCHEMA["required"] if field != "outreach_message"]
+}
+
+# JSON schema for batched enrichment (one entry per company, matched by id)
+BATCH_ENRICHMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "companies": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "estimated_revenue": {"type": "number", "description": "Estimated annual revenue in US dollars"},
+                    "estimated_employees": {"type": "string"},
+                    "strategic_insights": {"type": "string"}
+                },
+                "required": ["id", "estimated_revenue", "estimated_employees", "strategic_insights"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["companies"],
+    "additionalProperties": False
+}
+
+# Completion tokens reserved per company in a batched enrichment
+BATCH_OUTPUT_TOKENS_PER_COMPANY = 300
+
+class DeepSeekAPIError(Exception):
+    """Raised when the DeepSeek API returns a non-200 response"""
+
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(f"DeepSeek API error: {status_code} - {message}")
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
+
 class DeepSeekClient:
     """Client for DeepSeek API - OpenAI-compatible interface via OpenRouter"""
 
-    def __init__(self, api_key: str, base_url: str = "https://openrouter.ai/api/v1"):
+    def __init__(self, api_key: str, base_url: str = "https://openrouter.ai/api/v1", config=None,
+                 cache: Optional[ResponseCache] = None, rate_limiter: Optional[AdaptiveRateLimiter] = None):
         self.api_key = api_key
         self.base_url = base_url
+        self.config = config
         self.model = "deepseek/deepseek-chat"
-        self.client = httpx.Client(
+        self._owns_cache = cache is None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}  # callers awaiting each in-flight request
+        self.coalesced = 0
+        self._default_usage = self._new_usage_tracker()
+        self._run_usage: ContextVar[Optional[UsageTracker]] = ContextVar(f"deepseek_run_usage_{id(self)}", default=None)
+        self.cache = cache if cache is not None else self._build_cache()
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(
+            requests_per_minute=config.deepseek_requests_per_minute if config else 60,
+            tokens_per_minute=config.deepseek_tokens_per_minute if config else 200000,
+            initial_concurrency=config.deepseek_initial_concurrency if config else 4,
+            max_concurrency=config.deepseek_max_concurrency if config else 32
+        )
+        self.resilience = ResilienceLayer(
+            retry_policy=RetryPolicy(
+                max_attempts=config.llm_max_attempts if config else 4,
+                base_delay=config.llm_backoff_base if config else 0.5,
+                max_delay=config.llm_backoff_max if config else 20.0
+            ),
+            retry_budget=RetryBudget(config.llm_retry_budget if config else 50),
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=config.llm_breaker_failure_threshold if config else 5,
+                recovery_timeout=config.llm_breaker_recovery_timeout if config else 30.0
+            )
+        )
+        self.client = httpx.AsyncClient(
             base_url=base_url,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
                 "X-Title": "DuPont Tedlar Lead Generation"
             },
-            timeout=60.0
+            timeout=httpx.Timeout(
+                config.deepseek_timeout if config else 60.0,
+                connect=config.deepseek_connect_timeout if config else 5.0
+            ),
+            http2=self._http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=config.deepseek_max_connections if config else 100,
+                max_keepalive_connections=config.deepseek_max_keepalive_connections if config else 20,
+                keepalive_expiry=config.deepseek_keepalive_expiry if config else 30.0
+            )
         )
 
-    def __del__(self):
-        self.client.close()
+    def _http2_enabled(self) -> bool:
+        """HTTP/2 needs the optional h2 package (httpx[http2])"""
+        if self.config and not self.config.deepseek_http2:
+            return False
+        if not HTTP2_AVAILABLE:
+            logger.warning("h2 package not installed - falling back to HTTP/1.1 for DeepSeek API")
+            return False
+        return True
 
-    async def enrich_company_data(self, company_data: Dict) -> Dict:
-        """Enrich company data with DeepSeek analysis"""
-        try:
-            prompt = self._build_enrichment_prompt(company_data)
+    def _build_cache(self) -> Optional[ResponseCache]:
+        """Create the on-disk response cache described by the config"""
+        if self.config and not self.config.llm_cache_enabled:
+            return None
 
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a business research analyst specializing in company analysis and market intelligence."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1500
-                    }
+        try:
+            if self.config:
+                return ResponseCache(
+                    path=self.config.llm_cache_path,
+                    max_size_bytes=self.config.llm_cache_max_bytes,
+                    ttls=self.config.llm_cache_ttls
                 )
+            return ResponseCache()
+        except Exception as e:
+            logger.error(f"Could not open LLM response cache: {str(e)}")
+            return None
+
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self.client.aclose()
+        if self.cache and self._owns_cache:
+            self.cache.close()
+
+    def _new_usage_tracker(self) -> UsageTracker:
+        return UsageTracker(
+            prompt_price_per_million=self.config.deepseek_prompt_price_per_million if self.config else 0.30,
+            completion_price_per_million=self.config.deepseek_completion_price_per_million if self.config else 1.20
+        )
+
+    @property
+    def usage(self) -> UsageTracker:
+        """Usage tracker of the current run (see start_run), else the client-wide one"""
+        return self._run_usage.get() or self._default_usage
+
+    def start_run(self) -> UsageTracker:
+        """Reset per-run state (retry budget, usage accounting) and return the run's usage tracker
+
+        Both are bound to the calling context, so runs started from separate tasks
+        on a shared client keep separate retry budgets and usage accounting.
+        """
+        self.resilience.reset_budget()
+        tracker = self._new_usage_tracker()
+        self._run_usage.set(tracker)
+        return tracker
+
+    def cache_stats(self) -> Dict:
+        """Return response cache counters"""
+        return self.cache.stats() if self.cache else {}
+
+    def stats(self) -> Dict:
+        """Return cache, rate limiter and resilience metrics"""
+        return {
+            'cache': self.cache_stats(),
+            'coalesced_requests': self.coalesced,
+            'rate_limiter': self.rate_limiter.stats(),
+            'resilience': self.resilience.stats()
+        }
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, DeepSeekAPIError):
+            return error.retryable
+        return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    @staticmethod
+    def _is_breaker_failure(error: Exception) -> bool:
+        return not (isinstance(error, DeepSeekAPIError) and error.status_code == 429)
+
+    async def chat(self, messages: List[Dict], temperature: float = 0.3, max_tokens: int = 1000,
+                   call_type: str = "default", use_cache: bool = True, company: Optional[str] = None,
+                   **extra: Any) -> Dict:
+        """Send a chat completion request and return the decoded JSON response
+
+        Unless use_cache is False, identical requests are served from the response
+        cache and concurrent duplicates share a single in-flight request.
+        call_type selects the cache TTL and, with company, tags the call in the usage stats.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **extra
+        }
+
+        if not use_cache:
+            return await self._complete(payload, call_type=call_type, company=company)
+
+        started = time.monotonic()
+        fingerprint = ResponseCache.make_key(payload)
+        if self.cache:
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                self.usage.record(call_type, company, latency=time.monotonic() - started, source="cache")
+                return cached
+
+        # Single-flight: join an identical request that is already in progress
+        task = self._in_flight.get(fingerprint)
+        if task is None:
+            task = asyncio.ensure_future(self._complete(payload, fingerprint, call_type, company))
+            self._in_flight[fingerprint] = task
+            task.add_done_callback(lambda done: self._finish_in_flight(fingerprint, done))
+            return await self._join_in_flight(fingerprint, task)
+
+        self.coalesced += 1
+        result = await self._join_in_flight(fingerprint, task)
+        self.usage.record(call_type, company, latency=time.monotonic() - started, source="coalesced")
+        return result
+
+    async def _complete(self, payload: Dict, fingerprint: Optional[str] = None, call_type: str = "default",
+                        company: Optional[str] = None) -> Dict:
+        """Run a completion through the resilience layer, record its usage and cache the result"""
+        started = time.monotonic()
+        try:
+            result = await self.resilience.call(
+                lambda: self._post_completion(payload),
+                is_retryable=self._is_retryable,
+                is_breaker_failure=self._is_breaker_failure
             )
+        except Exception as e:
+            self.usage.record(call_type, company, latency=time.monotonic() - started, error=str(e)[:200])
+            raise
+
+        self.usage.record(call_type, company, result.get('usage'), time.monotonic() - started)
+
+        if self.cache and fingerprint:
+            self.cache.set(fingerprint, result, call_type)
+
+        return result
+
+    async def _join_in_flight(self, fingerprint: str, task: asyncio.Future) -> Dict:
+        """Await a shared in-flight request; it is cancelled once its last caller is
 
-            if response.status_code != 200:
-                logger.error(f"DeepSeek API error: {response.status_code} - {response.text}")
-                return company_data
+        The shield keeps one cancelled caller from cancelling the request for the
+        others, but a request nobody waits for any more is not worth its tokens.
+        """
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Forget it now so a new caller starts afresh instead of joining a cancelled request
+                    if self._in_flight.get(fingerprint) is task:
+                        del self._in_flight[fingerprint]
+                    task.cancel()
+
+    def _finish_in_flight(self, fingerprint: str, task: asyncio.Future):
+        """Forget a finished in-flight request"""
+        if self._in_flight.get(fingerprint) is task:
+            del self._in_flight[fingerprint]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every caller went away
+
+    async def _post_completion(self, payload: Dict) -> Dict:
+        """Send one rate-limited completion request"""
+        estimated = estimate_tokens(payload["messages"], payload.get("max_tokens", 0))
+
+        budget = current_budget()
+
+        async with self.rate_limiter.slot(estimated):
+            if budget:
+                budget.charge_request()
+            response = await self.client.post("/chat/completions", json=payload,
+                                              timeout=self._request_timeout(budget))
+            self.rate_limiter.record_response(response.status_code, response.headers)
+
+        if response.status_code != 200:
+            raise DeepSeekAPIError(response.status_code, response.text)
+
+        result = response.json()
+        total_tokens = result.get('usage', {}).get('total_tokens')
+        self.rate_limiter.record_usage(estimated, total_tokens)
+        if budget:
+            budget.charge_tokens(total_tokens)
+        return result
+
+    def _request_timeout(self, budget: Optional[RunBudget]) -> httpx.Timeout:
+        """Client timeouts, shortened so a request cannot outlive the run deadline"""
+        timeout = self.client.timeout
+        if not budget:
+            return timeout
+        return httpx.Timeout(budget.clamp_timeout(timeout.read), connect=budget.clamp_timeout(timeout.connect))
+
+    async def enrich_company_data(self, company_data: Dict, raise_on_error: bool = False) -> Dict:
+        """Enrich company data with DeepSeek analysis
+
+        On failure the data comes back unchanged, or the error is raised with raise_on_error.
+        """
+        try:
+            prompt = self._build_enrichment_prompt(company_data)
 
-            result = response.json()
+            result = await self.chat(
+                [
+                    {
+                        "role": "system",
+                        "content": "You are a business research analyst specializing in company analysis and market intelligence."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.3,
+                max_tokens=1500,
+                call_type="enrichment",
+                company=company_data.get('company_name')
+            )
             enriched_data = self._parse_enrichment_response(result)
 
             # Merge with original data
@@ -71,88 +385,215 @@ class DeepSeekClient:
 
         except Exception as e:
             logger.error(f"Error enriching company data: {str(e)}")
+            if raise_on_error:
+                raise
             return company_data
 
-    async def generate_outreach_message(self, lead_data: Dict) -> str:
-        """Generate personalized outreach message"""
+    async def chat_stream(self, messages: List[Dict], temperature: float = 0.3, max_tokens: int = 1000,
+                          call_type: str = "default", company: Optional[str] = None,
+                          **extra: Any) -> AsyncIterator[str]:
+        """Stream a chat completion over SSE, yielding content deltas as they arrive
+
+        Streams are never cached or retried; the circuit breaker and rate limiter still apply.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            **extra
+        }
+        estimated = estimate_tokens(messages, max_tokens)
+        usage = None
+        started = time.monotonic()
+        breaker = self.resilience.circuit_breaker
+        budget = current_budget()
+        breaker.before_call()
+
         try:
-            prompt = self._build_outreach_prompt(lead_data)
-
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a professional sales development representative crafting personalized outreach messages for B2B sales."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 800
-                    }
-                )
-            )
+            async with self.rate_limiter.slot(estimated):
+                if budget:
+                    budget.charge_request()
+                async with self.client.stream("POST", "/chat/completions", json=payload,
+                                              timeout=self._request_timeout(budget)) as response:
+                    self.rate_limiter.record_response(response.status_code, response.headers)
+
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        raise DeepSeekAPIError(response.status_code, body.decode('utf-8', errors='replace'))
+
+                    async for line in response.aiter_lines():
+                        # SSE comments (e.g. ": OPENROUTER PROCESSING") and blank keep-alives
+                        if not line.startswith('data:'):
+                            continue
+                        data = line[5:].strip()
+                        if data == '[DONE]':
+                            break
+
+                        chunk = json.loads(data)
+                        if chunk.get('usage'):
+                            usage = chunk['usage']
+                            self.rate_limiter.record_usage(estimated, usage.get('total_tokens'))
+                            if budget:
+                                budget.charge_tokens(usage.get('total_tokens'))
+                        for choice in chunk.get('choices', []):
+                            delta = (choice.get('delta') or {}).get('content')
+                            if delta:
+                                yield delta
+
+        except Exception as e:
+            if self._is_retryable(e) and self._is_breaker_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.release_probe()
+            self.usage.record(call_type, company, usage, time.monotonic() - started, error=str(e)[:200])
+            raise
+        except BaseException:
+            # Cancelled or closed early by the consumer
+            breaker.release_probe()
+            raise
+
+        breaker.record_success()
+        self.usage.record(call_type, company, usage, time.monotonic() - started)
+
+    def _outreach_messages(self, lead_data: Dict) -> List[Dict]:
+        """Chat messages for outreach generation"""
+        return [
+            {
+                "role": "system",
+                "content": "You are a professional sales development representative crafting personalized outreach messages for B2B sales."
+            },
+            {
+                "role": "user",
+                "content": self._build_outreach_prompt(lead_data)
+            }
+        ]
+
+    async def stream_outreach_message(self, lead_data: Dict, raise_on_error: bool = False) -> AsyncIterator[str]:
+        """Stream a personalized outreach message, yielding the text so far after each delta
+
+        If the stream fails, the non-streaming call (with retries) is made instead and
+        its complete message is yielded last, replacing any partial text.
+        """
+        message = ''
+        try:
+            async for delta in self.chat_stream(
+                self._outreach_messages(lead_data),
+                temperature=0.7,
+                max_tokens=800,
+                call_type="outreach",
+                company=lead_data.get('company_name')
+            ):
+                message += delta
+                yield message
 
-            if response.status_code != 200:
-                logger.error(f"DeepSeek API error: {response.status_code} - {response.text}")
-                return self._get_fallback_message(lead_data)
+        except Exception as e:
+            logger.error(f"Error streaming outreach message{' midway' if message else ''}: {str(e)}")
+            yield await self.generate_outreach_message(lead_data, raise_on_error)
+
+    async def generate_outreach_message(self, lead_data: Dict, raise_on_error: bool = False) -> str:
+        """Generate personalized outreach message
 
-            result = response.json()
+        On failure a generic template is returned, or the error is raised with raise_on_error.
+        """
+        try:
+            result = await self.chat(
+                self._outreach_messages(lead_data),
+                temperature=0.7,
+                max_tokens=800,
+                call_type="outreach",
+                company=lead_data.get('company_name'),
+                use_cache=False  # outreach should differ on every run
+            )
             message = result["choices"][0]["message"]["content"].strip()
 
             return message
 
         except Exception as e:
             logger.error(f"Error generating outreach message: {str(e)}")
+            if raise_on_error:
+                raise
             return self._get_fallback_message(lead_data)
 
-    async def identify_decision_makers(self, company_data: Dict) -> List[Dict]:
-        """Identify key decision makers for a company"""
+    async def identify_decision_makers(self, company_data: Dict, raise_on_error: bool = False) -> List[Dict]:
+        """Identify key decision makers for a company
+
+        On failure an empty list is returned, or the error is raised with raise_on_error.
+        """
         try:
             prompt = self._build_decision_maker_prompt(company_data)
 
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a sales intelligence specialist identifying key decision makers in B2B companies."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1000
+            result = await self.chat(
+                [
+                    {
+                        "role": "system",
+                        "content": "You are a sales intelligence specialist identifying key decision makers in B2B companies."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
                     }
-                )
+                ],
+                temperature=0.3,
+                max_tokens=1000,
+                call_type="decision_makers",
+                company=company_data.get('company_name')
             )
-
-            if response.status_code != 200:
-                logger.error(f"DeepSeek API error: {response.status_code} - {response.text}")
-                return []
-
-            result = response.json()
             decision_makers = self._parse_decision_makers_response(result)
 
             return decision_makers
 
         except Exception as e:
             logger.error(f"Error identifying decision makers: {str(e)}")
+            if raise_on_error:
+                raise
             return []
 
+    async def generate_lead_dossier(self, company_data: Dict, include_outreach: bool = True) -> Optional[Dict]:
+        """Generate enrichment, rationale, decision makers and outreach in one completion
+
+        Without include_outreach the dossier leaves out the outreach message (for
+        callers that stream it separately) and, having nothing run-specific in it,
+        is served from the response cache.
+        Returns None when the dossier cannot be produced or parsed, so callers can
+        fall back to the per-step methods.
+        """
+        try:
+            prompt = self._build_dossier_prompt(company_data, include_outreach)
+
+            result = await self.chat(
+                [
+                    {
+                        "role": "system",
+                        "content": "You are a B2B sales intelligence analyst preparing lead dossiers. Respond only with JSON matching the requested schema."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.4,
+                max_tokens=2000,
+                call_type="dossier",
+                use_cache=not include_outreach,  # the outreach message should differ on every run
+                company=company_data.get('company_name'),
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "lead_dossier",
+                        "strict": True,
+                        "schema": LEAD_DOSSIER_SCHEMA if include_outreach else LEAD_PROFILE_SCHEMA
+                    }
+                }
+            )
+
+            return self._parse_dossier_response(result, include_outreach)
+
+        except Exception as e:
+            logger.error(f"Error generating lead dossier: {str(e)}")
+            return None
+
     def _build_enrichment_prompt(self, company_data: Dict) -> str:
         """Build prompt for company data enrichment"""
         return f"""
@@ -243,6 +684,83 @@ class DeepSeekClient:
         Format as a structured list with specific, realistic job titles.
         """
 
+    def _build_dossier_prompt(self, company_data: Dict, include_outreach: bool = True) -> str:
+        """Build prompt for the combined lead dossier"""
+        revenue = company_data.get('estimated_revenue', 0) or 0
+        revenue_str = f"${revenue/1000000000:.1f}B" if revenue >= 1000000000 else f"${revenue/1000000:.0f}M" if revenue > 0 else "Not available"
+
+        events = company_data.get('events_attending', [])
+        events_str = ", ".join(events[:3]) if events else "Not available"
+
+        outreach_field = (
+            "- outreach_message: a unique, professional LinkedIn message under 150 words addressed to the first "
+            "decision maker's role, referencing the company's revenue size and events, with a clear call-to-action "
+            "for a brief call\n        "
+        ) if include_outreach else ""
+
+        return f"""
+        Prepare a complete sales lead dossier for DuPont Tedlar's Graphics & Signage team:
+
+        Company: {company_data.get('company_name', company_data.get('name', 'Unknown'))}
+        Website: {company_data.get('website', 'Unknown')}
+        Industry: {company_data.get('industry', 'Graphics & Signage')}
+        Revenue: {revenue_str}
+        Current Revenue Data: {company_data.get('revenue_text', 'Not available')}
+        Employee Count: {company_data.get('employees_text', company_data.get('employees', 'Not available'))}
+        Events They Attend: {events_str}
+        Description: {company_data.get('description', 'Not available')}
+
+        Return a JSON object with:
+        - estimated_revenue: annual revenue in US dollars as a number (0 if unknown)
+        - estimated_employees: employee count or range
+        - strategic_insights: market position, growth trajectory and pain points Tedlar's protective films could address
+        - qualification_rationale: 2-3 sentences on revenue size, industry fit and how Tedlar's durability, UV protection and weather resistance would benefit them
+        - decision_makers: 2-3 realistic job titles involved in material selection, operations, R&D or procurement of protective films, each with department and why they are relevant
+        {outreach_field}"""
+
+    def _parse_dossier_response(self, response: Dict, include_outreach: bool = True) -> Optional[Dict]:
+        """Parse the JSON lead dossier, returning None if it is unusable"""
+        try:
+            content = response["choices"][0]["message"]["content"].strip()
+
+            # Some providers wrap JSON in markdown fences even in JSON mode
+            content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content)
+            dossier = json.loads(content)
+
+            if not isinstance(dossier, dict):
+                logger.warning("Lead dossier is not a JSON object")
+                return None
+            if include_outreach and not dossier.get('outreach_message'):
+                logger.warning("Lead dossier missing outreach message")
+                return None
+
+            decision_makers = []
+            for dm in dossier.get('decision_makers') or []:
+                if isinstance(dm, dict) and dm.get('title'):
+                    decision_makers.append({
+                        'title': str(dm['title']).strip(),
+                        'department': str(dm.get('department', '')).strip(),
+                        'relevance': str(dm.get('relevance', '')).strip()
+                    })
+
+            try:
+                revenue = float(dossier.get('estimated_revenue') or 0)
+            except (TypeError, ValueError):
+                revenue = 0
+
+            return {
+                'estimated_revenue': revenue,
+                'estimated_employees': str(dossier.get('estimated_employees', '')).strip(),
+                'strategic_insights': str(dossier.get('strategic_insights', '')).strip(),
+                'qualification_rationale': str(dossier.get('qualification_rationale', '')).strip(),
+                'decision_makers': decision_makers[:3],
+                'outreach_message': str(dossier['outreach_message']).strip() if include_outreach else ''
+            }
+
+        except Exception as e:
+            logger.error(f"Error parsing lead dossier: {str(e)}")
+            return None
+
     def _parse_enrichment_response(self, response: Dict) -> Dict:
         """Parse DeepSeek enrichment response"""
         try:
@@ -341,23 +859,158 @@ Best regards,
 [Your name]"""
 
     async def enrich_multiple_companies(self, companies: List[Dict]) -> List[Dict]:
-        """Enrich multiple companies concurrently"""
-        semaphore = asyncio.Semaphore(3)  # Limit concurrent requests
+        """Enrich multiple companies concurrently (paced by the shared rate limiter)
 
-        async def enrich_with_semaphore(company):
-            async with semaphore:
-                return await self.enrich_company_data(company)
+        With batching enabled, companies are packed into shared completions sized by a
+        token budget; only companies missing from a batch response are retried individually.
+        """
+        pending = list(range(len(companies)))
+        if len(companies) > 1 and (self.config.llm_batch_enrichment if self.config else True):
+            pending = await self._enrich_in_batches(companies)
 
-        tasks = [enrich_with_semaphore(company) for company in companies]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [self.enrich_company_data(companies[i]) for i in pending]
+        results = dict(zip(pending, await asyncio.gather(*tasks, return_exceptions=True)))
 
         # Handle exceptions
         processed_results = []
-        for i, result in enumerate(results):
+        for i, company in enumerate(companies):
+            result = results.get(i, company)
             if isinstance(result, Exception):
-                logger.error(f"Error enriching company {companies[i]['company_name']}: {str(result)}")
-                processed_results.append(companies[i])  # Return original data
+                logger.error(f"Error enriching company {company['company_name']}: {str(result)}")
+                processed_results.append(company)  # Return original data
             else:
                 processed_results.append(result)
 
         return processed_results
+
+    async def _enrich_in_batches(self, companies: List[Dict]) -> List[int]:
+        """Enrich companies in batched completions, returning indices that still need enrichment"""
+        batches = self._plan_enrichment_batches(companies)
+        logger.info(f"Enriching {len(companies)} companies in {len(batches)} batched requests")
+
+        results = await asyncio.gather(
+            *[self._enrich_batch([companies[i] for i in batch]) for batch in batches],
+            return_exceptions=True
+        )
+
+        failed = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error(f"Batched enrichment failed: {str(result)}")
+                failed.extend(batch)
+                continue
+
+            for position, index in enumerate(batch):
+                if position in result:
+                    companies[index].update(result[position])
+                else:
+                    failed.append(index)
+
+        if failed:
+            logger.warning(f"Retrying {len(failed)} companies missing from batched enrichment")
+        return sorted(failed)
+
+    def _plan_enrichment_batches(self, companies: List[Dict]) -> List[List[int]]:
+        """Greedily pack company indices into batches that fit the prompt and output token budgets"""
+        prompt_budget = self.config.llm_batch_token_budget if self.config else 6000
+        output_budget = self.config.llm_batch_max_output_tokens if self.config else 6000
+        max_companies = max(1, output_budget // BATCH_OUTPUT_TOKENS_PER_COMPANY)
+        base_tokens = len(self._build_batch_enrichment_prompt([])) // 4
+
+        batches = []
+        current = []
+        current_tokens = base_tokens
+        for i, company in enumerate(companies):
+            company_tokens = len(self._format_batch_company(0, company)) // 4
+            if current and (current_tokens + company_tokens > prompt_budget or len(current) >= max_companies):
+                batches.append(current)
+                current = []
+                current_tokens = base_tokens
+            current.append(i)
+            current_tokens += company_tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _enrich_batch(self, batch: List[Dict]) -> Dict[int, Dict]:
+        """Enrich one batch; returns enrichment data keyed by position in the batch"""
+        result = await self.chat(
+            [
+                {
+                    "role": "system",
+                    "content": "You are a business research analyst specializing in company analysis and market intelligence. Respond only with JSON matching the requested schema."
+                },
+                {
+                    "role": "user",
+                    "content": self._build_batch_enrichment_prompt(batch)
+                }
+            ],
+            temperature=0.3,
+            max_tokens=BATCH_OUTPUT_TOKENS_PER_COMPANY * len(batch) + 200,
+            call_type="enrichment",
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "batch_enrichment", "strict": True, "schema": BATCH_ENRICHMENT_SCHEMA}
+            }
+        )
+        return self._parse_batch_enrichment_response(result, len(batch))
+
+    def _format_batch_company(self, company_id: int, company_data: Dict) -> str:
+        """Delimited company block for batched prompts"""
+        return f"""
+        [Company {company_id}]
+        Company: {company_data.get('company_name', 'Unknown')}
+        Website: {company_data.get('website', 'Unknown')}
+        Industry: {company_data.get('industry', 'Unknown')}
+        Current Revenue Data: {company_data.get('revenue_text', 'Not available')}
+        Employee Count: {company_data.get('employees_text', 'Not available')}
+        Description: {company_data.get('description', 'Not available')}
+        """
+
+    def _build_batch_enrichment_prompt(self, companies: List[Dict]) -> str:
+        """Build one enrichment prompt covering several companies"""
+        company_blocks = "".join(self._format_batch_company(i, company) for i, company in enumerate(companies))
+
+        return f"""
+        Analyze each of the following companies and provide enhanced business intelligence.
+        {company_blocks}
+        For EACH company return an entry in "companies" with its id and:
+        - estimated_revenue: estimated annual revenue in US dollars as a number (0 if unknown)
+        - estimated_employees: employee count range or specific number
+        - strategic_insights: key products relevant to graphics & signage, market position, growth
+          trajectory, and strategic priorities or pain points that Tedlar could address
+
+        Focus on aspects relevant to protective films, coatings, and graphics/signage applications.
+        Provide specific, actionable insights that would be valuable for sales outreach.
+        """
+
+    def _parse_batch_enrichment_response(self, response: Dict, batch_size: int) -> Dict[int, Dict]:
+        """Split a batched enrichment response back into per-company data"""
+        content = response["choices"][0]["message"]["content"].strip()
+        content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content)
+        entries = json.loads(content).get('companies', [])
+
+        parsed = {}
+        for entry in entries:
+            try:
+                company_id = int(entry['id'])
+                if company_id < 0 or company_id >= batch_size or company_id in parsed:
+                    continue
+
+                enriched_data = {}
+                revenue = float(entry.get('estimated_revenue') or 0)
+                if revenue > 0:
+                    enriched_data['estimated_revenue'] = revenue
+                if entry.get('estimated_employees'):
+                    enriched_data['estimated_employees'] = str(entry['estimated_employees']).strip()
+                if entry.get('strategic_insights'):
+                    enriched_data['strategic_insights'] = str(entry['strategic_insights']).strip()
+
+                if enriched_data:
+                    parsed[company_id] = enriched_data
+
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed batch enrichment entry: {str(e)}")
+
+        return parsed
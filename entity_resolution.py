@@ -0,0 +1,189 @@
+"""
+Company entity resolution for deduplicating leads across events and runs
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from validation import COMPANY_SUFFIX_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX_RE = re.compile('|'.join(COMPANY_SUFFIX_PATTERNS), re.IGNORECASE)
+
+# Hosts that say nothing about which company a website belongs to
+_SHARED_DOMAINS = {'linkedin.com', 'facebook.com', 'twitter.com', 'x.com', 'youtube.com',
+                   'instagram.com', 'wikipedia.org', 'crunchbase.com', 'google.com'}
+
+def normalize_company_name(name: str) -> str:
+    """Lower-case a company name and strip legal suffixes, punctuation and a leading "The" """
+    name = re.sub(r'\s+', ' ', (name or '').strip())
+
+    # "Foo Co., Ltd." needs the suffixes peeled off one at a time
+    previous = None
+    while name != previous:
+        previous = name
+        name = _SUFFIX_RE.sub('', name.rstrip(' ,'))
+
+    name = name.lower().replace('&', ' and ')
+    name = re.sub(r'[^\w\s]', ' ', name)
+    name = re.sub(r'^the\s+', '', name.strip())
+    return re.sub(r'\s+', ' ', name).strip()
+
+def company_domain(website: str) -> str:
+    """Registered domain of a company website ("https://www.3m.com/graphics" -> "3m.com")"""
+    if not website or website == 'N/A':
+        return ''
+
+    host = urlparse(website if '//' in website else f"//{website}").hostname or ''
+    labels = host.lower().split('.')
+    if len(labels) < 2:
+        return ''
+
+    # Keep three labels for country domains like example.co.uk
+    keep = 3 if len(labels) >= 3 and len(labels[-2]) <= 3 and len(labels[-1]) == 2 else 2
+    domain = '.'.join(labels[-keep:])
+    return '' if domain in _SHARED_DOMAINS else domain
+
+class EntityResolver:
+    """Maps company name variants to one entity ID
+
+    Names match when they normalize identically, share a website domain, one is a
+    word-prefix of the other ("3M" / "3M Commercial Graphics") or they are nearly
+    identical strings. Fuzzy comparisons only run inside blocks of names that share
+    a first word or leading characters, keeping resolution near-linear. Known
+    aliases are persisted so IDs stay stable across runs.
+    """
+
+    def __init__(self, path: Optional[str] = ".cache/entities.sqlite", similarity_threshold: float = 0.9):
+        self.similarity_threshold = similarity_threshold
+
+        self._aliases: Dict[str, str] = {}  # normalized name -> entity ID
+        self._domains: Dict[str, str] = {}  # domain -> entity ID
+        self._blocks: Dict[str, Set[str]] = {}  # block key -> normalized names
+
+        # Metrics
+        self.lookups = 0
+        self.matches = 0
+        self.comparisons = 0
+
+        self.conn = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS aliases (
+                    alias TEXT PRIMARY KEY,
+                    entity_id TEXT NOT NULL,
+                    domain TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+            for alias, entity_id, domain in self.conn.execute("SELECT alias, entity_id, domain FROM aliases"):
+                self._index(alias, entity_id, domain)
+
+    @staticmethod
+    def _block_keys(normalized: str) -> List[str]:
+        compact = normalized.replace(' ', '')
+        return [f"w:{normalized.split(' ')[0]}", f"c:{compact[:4]}"]
+
+    def _index(self, alias: str, entity_id: str, domain: str = ''):
+        self._aliases[alias] = entity_id
+        if domain:
+            self._domains.setdefault(domain, entity_id)
+        for key in self._block_keys(alias):
+            self._blocks.setdefault(key, set()).add(alias)
+
+    def _is_match(self, a: str, b: str) -> bool:
+        self.comparisons += 1
+        short, long = sorted((a.split(' '), b.split(' ')), key=len)
+        if len(''.join(short)) >= 2 and long[:len(short)] == short:
+            return True
+        return SequenceMatcher(None, a, b).ratio() >= self.similarity_threshold
+
+    def resolve(self, name: str, website: str = '') -> str:
+        """Return the entity ID for a company, registering it if it is new"""
+        self.lookups += 1
+        normalized = normalize_company_name(name) or (name or '').strip().lower()
+        domain = company_domain(website)
+
+        entity_id = self._aliases.get(normalized)
+        if entity_id is None and domain:
+            entity_id = self._domains.get(domain)
+        if entity_id is None:
+            candidates = set()
+            for key in self._block_keys(normalized):
+                candidates |= self._blocks.get(key, set())
+            for candidate in sorted(candidates, key=len):
+                if self._is_match(normalized, candidate):
+                    entity_id = self._aliases[candidate]
+                    break
+
+        if entity_id is not None:
+            self.matches += 1
+        else:
+            entity_id = normalized
+
+        if normalized not in self._aliases or (domain and domain not in self._domains):
+            self._index(normalized, entity_id, domain)
+            self._persist(normalized, entity_id, domain)
+        return entity_id
+
+    def _persist(self, alias: str, entity_id: str, domain: str):
+        if not self.conn:
+            return
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO aliases (alias, entity_id, domain, updated_at) VALUES (?, ?, ?, ?)",
+                (alias, entity_id, domain, time.time())
+            )
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error saving entity alias {alias}: {str(e)}")
+
+    def merge_companies(self, companies: List[Dict]) -> List[Dict]:
+        """Collapse duplicate companies, keeping the first and merging the others into it
+
+        Each kept company gets an 'entity_id'; events are unioned and missing fields filled in.
+        """
+        merged: Dict[str, Dict] = {}
+        for company in companies:
+            entity_id = self.resolve(company.get('name', ''), company.get('website', ''))
+            if entity_id not in merged:
+                merged[entity_id] = {**company, 'entity_id': entity_id}
+            else:
+                self.merge_into(merged[entity_id], company)
+        return list(merged.values())
+
+    @staticmethod
+    def merge_into(known: Dict, duplicate: Dict):
+        """Fold a duplicate record into the kept one"""
+        for event in duplicate.get('events_attending', []):
+            if event not in known.setdefault('events_attending', []):
+                known['events_attending'].append(event)
+        for field, value in duplicate.items():
+            if value and known.get(field) in (None, '', 'N/A', 0, []):
+                known[field] = value
+
+    def stats(self) -> Dict:
+        return {
+            'entities': len(set(self._aliases.values())),
+            'aliases': len(self._aliases),
+            'lookups': self.lookups,
+            'matches': self.matches,
+            'comparisons': self.comparisons
+        }
+
+    def close(self):
+        """Close the SQLite connection"""
+        if self.conn:
+            self.conn.close()
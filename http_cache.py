@@ -0,0 +1,194 @@
+"""
+On-disk HTTP cache with conditional revalidation for the web scraper
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class HttpCache:
+    """SQLite-backed cache of GET responses with zlib-compressed bodies
+
+    An entry is served without a request while it is fresh (per-domain TTL). Once
+    stale it is kept, together with its ETag / Last-Modified validators, so the
+    next fetch can be a conditional request answered by a 304.
+    """
+
+    def __init__(self, path: str = ".cache/http_cache.sqlite", max_size_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None, max_stale: int = 30 * 86400):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = self.ttls.get('default', 86400)
+        self.max_stale = max_stale  # stale entries older than this are dropped instead of revalidated
+
+        # Counters for the current process
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                raw_size INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_lru ON pages (last_accessed)")
+        self.conn.commit()
+
+    def ttl_for(self, url: str) -> int:
+        """Freshness lifetime for a URL: the most specific matching domain, else the default"""
+        host = (urlparse(url).hostname or '').lower()
+        best, best_length = self.default_ttl, -1
+        for domain, ttl in self.ttls.items():
+            if domain != 'default' and (host == domain or host.endswith('.' + domain)) and len(domain) > best_length:
+                best, best_length = ttl, len(domain)
+        return best
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL (fresh or stale), or None"""
+        try:
+            row = self.conn.execute(
+                "SELECT status, headers, body, raw_size, etag, last_modified, stored_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            status, headers, body, raw_size, etag, last_modified, stored_at = row
+            return {
+                'status': status,
+                'headers': json.loads(headers),
+                'body': zlib.decompress(body),
+                'raw_size': raw_size,
+                'etag': etag,
+                'last_modified': last_modified,
+                'stored_at': stored_at,
+                'fresh': time.time() - stored_at < self.ttl_for(url)
+            }
+
+        except Exception as e:
+            logger.error(f"Error reading HTTP cache: {str(e)}")
+            return None
+
+    @staticmethod
+    def validators(entry: Dict) -> Dict[str, str]:
+        """Conditional request headers for revalidating a stale entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record_hit(self, url: str, entry: Dict):
+        """Count a fresh entry served without a request"""
+        self.hits += 1
+        self.bytes_saved += entry['raw_size']
+        self._touch(url, refresh=False)
+
+    def record_revalidated(self, url: str, entry: Dict):
+        """Count a 304 and restart the entry's freshness lifetime"""
+        self.revalidated += 1
+        self.bytes_saved += entry['raw_size']
+        self._touch(url, refresh=True)
+
+    def _touch(self, url: str, refresh: bool):
+        now = time.time()
+        try:
+            if refresh:
+                self.conn.execute("UPDATE pages SET stored_at = ?, last_accessed = ? WHERE url = ?", (now, now, url))
+            else:
+                self.conn.execute("UPDATE pages SET last_accessed = ? WHERE url = ?", (now, url))
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error updating HTTP cache: {str(e)}")
+
+    def set(self, url: str, status: int, headers: Dict[str, str], body: bytes):
+        """Store a response unless the server forbids it"""
+        self.misses += 1
+        headers = {key.lower(): value for key, value in headers.items()}
+        if 'no-store' in headers.get('cache-control', '').lower():
+            return
+
+        try:
+            compressed = zlib.compress(body, 6)
+            now = time.time()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, status, headers, body, raw_size, size, etag, last_modified, "
+                "stored_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(headers), compressed, len(body), len(compressed),
+                 headers.get('etag'), headers.get('last-modified'), now, now)
+            )
+            self.conn.commit()
+            self._evict()
+
+        except Exception as e:
+            logger.error(f"Error writing HTTP cache: {str(e)}")
+
+    def _evict(self):
+        """Drop entries stale for too long, then least recently used ones until under the size limit"""
+        self.conn.execute("DELETE FROM pages WHERE stored_at < ?", (time.time() - self.max_stale,))
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total > self.max_size_bytes:
+            rows = self.conn.execute("SELECT url, size FROM pages ORDER BY last_accessed ASC").fetchall()
+            for url, size in rows:
+                if total <= self.max_size_bytes:
+                    break
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                total -= size
+                self.evictions += 1
+
+        self.conn.commit()
+
+    def stats(self) -> Dict:
+        """Return hit/revalidation counters and current cache size"""
+        entries, size, raw_size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM pages"
+        ).fetchone()
+        lookups = self.hits + self.revalidated + self.misses
+
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.revalidated) / lookups if lookups else 0.0,
+            'bytes_saved': self.bytes_saved,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+            'uncompressed_bytes': raw_size
+        }
+
+    def clear(self):
+        """Remove all cached pages"""
+        self.conn.execute("DELETE FROM pages")
+        self.conn.commit()
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.conn.close()
@@ -5,18 +5,28 @@ Lead processor for coordinating data collection and enrichment
 import asyncio
 import logging
 import re
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from urllib.parse import urljoin, urlparse
 import json
+from entity_resolution import EntityResolver
+from pipeline import Pipeline, Stage
+from validation import LeadQualificationGate
 
 logger = logging.getLogger(__name__)
 
 class LeadProcessor:
     """Coordinates lead generation, data enrichment, and outreach"""
 
-    def __init__(self, scraper, deepseek_client):
+    def __init__(self, scraper, deepseek_client, config=None):
         self.scraper = scraper
         self.deepseek_client = deepseek_client
+        self.config = config
+        self.pipeline_stats = {}
+        self.qualification_gate = LeadQualificationGate(config)
+        self.entity_resolver = EntityResolver(
+            (config.entity_store_path or None) if config else None,
+            config.entity_similarity_threshold if config else 0.9
+        )
 
     async def research_events(self, target_events: List[str] = None) -> List[Dict]:
         """Research relevant industry events and associations"""
@@ -48,7 +58,7 @@ class LeadProcessor:
             logger.error(f"Error researching events: {str(e)}")
             return []
 
-'''
+    '''
     async def _search_event_info(self, event_name: str) -> Dict:
         """Search for event information"""
         # This would typically involve web searches or API calls
@@ -137,17 +147,8 @@ class LeadProcessor:
         return website_mapping.get(company_name, 'N/A')
 
     def _deduplicate_companies(self, companies: List[Dict]) -> List[Dict]:
-        """Remove duplicate companies"""
-        seen = set()
-        unique = []
-
-        for company in companies:
-            company_key = company['name'].lower()
-            if company_key not in seen:
-                seen.add(company_key)
-                unique.append(company)
-
-        return unique
+        """Remove duplicate companies, including name variants of the same entity"""
+        return self.entity_resolver.merge_companies(companies)
 
     async def filter_companies(self, companies: List[Dict], min_revenue: float = 100000000, max_results: int = 50) -> List[Dict]:
         """Filter companies by revenue and size criteria"""
@@ -171,7 +172,7 @@ class LeadProcessor:
         logger.info(f"Filtered to {len(filtered_companies)} companies meeting revenue criteria")
         return filtered_companies[:max_results]
 
-'''
+    '''
     def _assign_mock_revenue(self, company_name: str) -> float:
         """Assign mock revenue data for demo purposes"""
         # Large established companies
@@ -231,18 +232,22 @@ class LeadProcessor:
         enriched_companies = []
 
         for company in companies:
-            # Use DeepSeek to identify relevant decision makers
-            decision_makers = await self.deepseek_client.identify_decision_makers(company)
+            enriched_companies.append(await self._add_decision_makers(company))
 
-            # Add decision makers to company data
-            company['decision_makers'] = decision_makers
+        return enriched_companies
 
-            # Generate mock contact information for demo
-            company['contacts'] = self._generate_mock_contacts(decision_makers, company['company_name'])
+    async def _add_decision_makers(self, company: Dict) -> Dict:
+        """Identify decision makers and contacts for one company"""
+        # Use DeepSeek to identify relevant decision makers
+        decision_makers = await self.deepseek_client.identify_decision_makers(company)
 
-            enriched_companies.append(company)
+        # Add decision makers to company data
+        company['decision_makers'] = decision_makers
 
-        return enriched_companies
+        # Generate mock contact information for demo
+        company['contacts'] = self._generate_mock_contacts(decision_makers, company['company_name'])
+
+        return company
 
     def _generate_mock_contacts(self, decision_makers: List[Dict], company_name: str) -> List[Dict]:
         """Generate mock contact information for demo purposes"""
@@ -294,29 +299,84 @@ class LeadProcessor:
         final_leads = []
 
         for company in companies:
-            # Generate message for primary contact
-            primary_contact = company.get('contacts', [{}])[0] if company.get('contacts') else {}
-
-            if primary_contact:
-                lead_data = {
-                    'company_name': company.get('company_name', ''),
-                    'contact_name': primary_contact.get('name', 'Decision Maker'),
-                    'contact_title': primary_contact.get('title', ''),
-                    'industry': company.get('industry', ''),
-                    'employees': company.get('employees', 'Unknown'),
-                    'estimated_revenue': company.get('estimated_revenue', 0),
-                    'website': company.get('website', ''),
-                    'events_attending': company.get('events_attending', []),
-                    'description': company.get('description', ''),
-                    'qualification_rationale': company.get('qualification_rationale', '')
-                }
+            final_leads.append(await self._add_outreach_message(company))
 
-                # Generate personalized message
-                outreach_message = await self.deepseek_client.generate_outreach_message(lead_data)
-
-                company['outreach_message'] = outreach_message
-                company['primary_contact'] = primary_contact
+        return final_leads
 
-            final_leads.append(company)
+    async def _add_outreach_message(self, company: Dict) -> Dict:
+        """Generate the outreach message for one company's primary contact"""
+        primary_contact = company.get('contacts', [{}])[0] if company.get('contacts') else {}
+
+        if primary_contact:
+            lead_data = {
+                'company_name': company.get('company_name', ''),
+                'contact_name': primary_contact.get('name', 'Decision Maker'),
+                'contact_title': primary_contact.get('title', ''),
+                'industry': company.get('industry', ''),
+                'employees': company.get('employees', 'Unknown'),
+                'estimated_revenue': company.get('estimated_revenue', 0),
+                'website': company.get('website', ''),
+                'events_attending': company.get('events_attending', []),
+                'description': company.get('description', ''),
+                'qualification_rationale': company.get('qualification_rationale', '')
+            }
 
-        return final_leads
+            # Generate personalized message
+            outreach_message = await self.deepseek_client.generate_outreach_message(lead_data)
+
+            company['outreach_message'] = outreach_message
+            company['primary_contact'] = primary_contact
+
+        return company
+
+    async def stream_leads(self, companies: List[Dict]) -> AsyncIterator[Dict]:
+        """Run companies through scrape -> enrich -> qualify -> contacts -> outreach stages
+
+        Stages overlap through bounded queues, each with its own concurrency, and
+        finished leads are yielded as soon as they leave the outreach stage.
+        Companies failing the qualification gate on their enriched data are dropped
+        before any decision maker or outreach call is spent on them.
+        """
+        concurrency = self.config.pipeline_stage_concurrency if self.config else {}
+        stages = [
+            Stage('scrape', self._scrape_stage, concurrency.get('scrape', 5)),
+            Stage('enrich', self._enrich_stage, concurrency.get('enrich', 4)),
+            Stage('qualify', self._qualify_stage, concurrency.get('qualify', 4)),
+            Stage('contacts', self._add_decision_makers, concurrency.get('contacts', 4)),
+            Stage('outreach', self._add_outreach_message, concurrency.get('outreach', 4))
+        ]
+        pipeline = Pipeline(stages, queue_size=self.config.pipeline_queue_size if self.config else 10)
+
+        logger.info(f"Streaming {len(companies)} companies through the lead pipeline")
+        try:
+            async for lead in pipeline.run(companies):
+                yield lead
+        finally:
+            self.pipeline_stats = pipeline.stats()
+
+    async def _scrape_stage(self, company: Dict) -> Dict:
+        """Scrape one company and parse numeric values"""
+        scraped = await self.scraper.get_company_data(company['name'], company['website'])
+        if 'revenue_text' in scraped:
+            scraped['revenue'] = self.scraper._parse_revenue(scraped['revenue_text'])
+        if 'employees_text' in scraped:
+            scraped['employees'] = self.scraper._parse_employees(scraped['employees_text'])
+
+        # Keep discovery data (events, revenue estimates) alongside the scraped fields
+        return {**company, **scraped}
+
+    async def _enrich_stage(self, company: Dict) -> Dict:
+        """Enrich one company with DeepSeek"""
+        return await self.deepseek_client.enrich_company_data(company)
+
+    async def _qualify_stage(self, company: Dict) -> Optional[Dict]:
+        """Check one enriched company against the qualification gate and add its rationale; None drops it"""
+        # Scraped revenue stands in when neither discovery nor enrichment estimated one
+        if not company.get('estimated_revenue') and company.get('revenue'):
+            company['estimated_revenue'] = company['revenue']
+
+        if not self.qualification_gate.qualifies(company):
+            return None
+
+        company['qualification_rationale'] = self._generate_qualification_rationale(company)
+        return company
@@ -0,0 +1,138 @@
+"""
+Persistent, content-addressed response cache for DeepSeek chat completions
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with per-call-type TTLs and LRU size eviction"""
+
+    def __init__(self, path: str = ".cache/llm_responses.sqlite", max_size_bytes: int = 50 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None, default_ttl: int = 86400):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.ttls = ttls or {}
+        self.default_ttl = self.ttls.get('default', default_ttl)
+
+        # Counters for the current process
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                call_type TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses (last_accessed)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(payload: Dict) -> str:
+        """Hash the request payload (model, messages, temperature, max_tokens and any extra options)"""
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached response, or None if missing or expired"""
+        try:
+            row = self.conn.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.conn.commit()
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+        except Exception as e:
+            logger.error(f"Error reading LLM cache: {str(e)}")
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: Dict, call_type: str = "default"):
+        """Store a response using the TTL configured for its call type"""
+        try:
+            body = json.dumps(response, ensure_ascii=False)
+            now = time.time()
+            ttl = self.ttls.get(call_type, self.default_ttl)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, call_type, response, size, created_at, expires_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, call_type, body, len(body.encode('utf-8')), now, now + ttl, now)
+            )
+            self.conn.commit()
+            self._evict()
+
+        except Exception as e:
+            logger.error(f"Error writing LLM cache: {str(e)}")
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under the size limit"""
+        self.conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_size_bytes:
+            rows = self.conn.execute("SELECT key, size FROM responses ORDER BY last_accessed ASC").fetchall()
+            for key, size in rows:
+                if total <= self.max_size_bytes:
+                    break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                self.evictions += 1
+
+        self.conn.commit()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current cache size"""
+        entries, size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def clear(self):
+        """Remove all cached responses"""
+        self.conn.execute("DELETE FROM responses")
+        self.conn.commit()
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.conn.close()
@@ -0,0 +1,340 @@
+"""
+Local OpenRouter-compatible stand-in server for offline load testing
+
+Run:  python mock_openrouter.py --port 8001 --latency-ms 800 --error-rate 0.02
+Then: DeepSeekClient(api_key="test", base_url="http://127.0.0.1:8001/api/v1")
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+COMPANY_POOL = [
+    ("3M Commercial Graphics", "https://www.3m.com", "$35 billion", "95,000"),
+    ("Avery Dennison Corporation", "https://www.averydennison.com", "$8.5 billion", "35,000"),
+    ("HP Inc. Large Format", "https://www.hp.com", "$53 billion", "58,000"),
+    ("Canon Solutions America", "https://csa.canon.com", "$4.5 billion", "11,000"),
+    ("Electronics For Imaging", "https://www.efi.com", "$1 billion", "3,400"),
+    ("Mactac Graphics", "https://www.mactac.com", "$600 million", "1,500"),
+    ("Arlon Graphics", "https://www.arlon.com", "$500 million", "1,200"),
+    ("Mimaki USA", "https://www.mimakiusa.com", "$550 million", "2,000"),
+    ("Roland DGA", "https://www.rolanddga.com", "$700 million", "1,300"),
+    ("Orafol Americas", "https://www.orafol.com", "$900 million", "2,800"),
+    ("Ritrama", "https://www.ritrama.com", "$550 million", "1,100"),
+    ("Fujifilm North America", "https://www.fujifilm.com", "$20 billion", "73,000"),
+    ("Agfa Graphics", "https://www.agfa.com", "$2 billion", "7,000"),
+    ("Durst Group", "https://www.durst-group.com", "$700 million", "1,200"),
+    ("Epson America", "https://epson.com", "$9 billion", "77,000"),
+    ("Lintec Corporation", "https://www.lintec-global.com", "$2.2 billion", "5,000"),
+]
+
+EVENT_POOL = [
+    ("ISA International Sign Expo", "https://www.signexpo.org"),
+    ("PRINTING United Expo", "https://www.printingunited.com"),
+    ("FESPA Global Print Expo", "https://www.fespa.com"),
+    ("Digital Signage Expo", "https://www.dsexpo.com"),
+    ("Labelexpo Americas", "https://www.labelexpo-americas.com"),
+    ("SGIA Expo", "https://www.sgia.org"),
+    ("Sign Association Annual Meeting", "https://www.signs.org"),
+]
+
+DECISION_MAKER_TITLES = [
+    ("VP of Product Development", "Product"),
+    ("Director of Operations", "Operations"),
+    ("Head of R&D", "Research & Development"),
+    ("Director of Procurement", "Procurement"),
+    ("Chief Technology Officer", "Technology"),
+]
+
+class MockBehaviour:
+    """Latency, error and rate-limit behaviour of the mock server"""
+
+    def __init__(self, latency_ms: float = 800, latency_dist: str = "lognormal", latency_sigma: float = 0.5,
+                 ms_per_token: float = 0.0, error_rate: float = 0.0, burst_every: float = 0.0,
+                 burst_duration: float = 5.0, rpm_limit: int = 0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.latency_sigma = latency_sigma
+        self.ms_per_token = ms_per_token
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_duration = burst_duration
+        self.rpm_limit = rpm_limit
+        self.random = random.Random(seed)
+        self.started_at = time.monotonic()
+        self.request_times = deque()
+        self.stats = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'streams': 0}
+
+    def latency(self, completion_tokens: int) -> float:
+        """Seconds to wait before responding"""
+        base = self.latency_ms / 1000.0
+        if self.latency_dist == "fixed":
+            delay = base
+        elif self.latency_dist == "uniform":
+            delay = self.random.uniform(0, 2 * base)
+        else:
+            # Lognormal with the configured median
+            delay = base * self.random.lognormvariate(0, self.latency_sigma)
+        return delay + completion_tokens * self.ms_per_token / 1000.0
+
+    def in_burst(self) -> Optional[float]:
+        """Seconds left in the current 429 burst, or None outside bursts"""
+        if not self.burst_every:
+            return None
+        elapsed = (time.monotonic() - self.started_at) % self.burst_every
+        if elapsed >= self.burst_every - self.burst_duration:
+            return self.burst_every - elapsed
+        return None
+
+    def rate_limit_headers(self) -> Dict[str, str]:
+        """Sliding-window requests-per-minute accounting in OpenAI-style headers"""
+        if not self.rpm_limit:
+            return {}
+        now = time.monotonic()
+        while self.request_times and now - self.request_times[0] > 60:
+            self.request_times.popleft()
+        reset = 60 - (now - self.request_times[0]) if self.request_times else 0
+        return {
+            'x-ratelimit-limit-requests': str(self.rpm_limit),
+            'x-ratelimit-remaining-requests': str(max(0, self.rpm_limit - len(self.request_times))),
+            'x-ratelimit-reset-requests': f"{reset:.1f}s"
+        }
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def _prompt_value(prompt: str, field: str, default: str = "") -> str:
+    match = re.search(rf'^\s*{field}:\s*(.+)$', prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+def _pick(rng: random.Random, pool: List, count: int) -> List:
+    return rng.sample(pool, min(count, len(pool)))
+
+def _events_response(rng: random.Random) -> str:
+    lines = []
+    for i, (name, url) in enumerate(_pick(rng, EVENT_POOL, 6), 1):
+        lines += [
+            f"{i}. {name}",
+            "Description: Major trade show for graphics, signage and printing professionals",
+            "Attendees: Sign manufacturers, print service providers, material suppliers",
+            f"Website: {url}",
+            ""
+        ]
+    return "\n".join(lines)
+
+def _companies_response(rng: random.Random) -> str:
+    lines = []
+    for i, (name, url, revenue, employees) in enumerate(_pick(rng, COMPANY_POOL, 15), 1):
+        events = ", ".join(name for name, _ in _pick(rng, EVENT_POOL, 3))
+        lines += [
+            f"{i}. {name}",
+            f"Website: {url}",
+            f"Revenue: {revenue}",
+            f"Employees: {employees}",
+            "Products: Graphic films, signage materials, wide-format printing solutions",
+            f"Events: {events}",
+            ""
+        ]
+    return "\n".join(lines)
+
+def _enrichment_response(rng: random.Random, company: str) -> str:
+    revenue = rng.choice(["$650 million", "$1.2 billion", "$2.5 billion", "$8.5 billion"])
+    employees = rng.choice(["1,200", "3,500", "10,000", "35,000"])
+    return "\n".join([
+        f"1. Estimated annual revenue: {revenue}",
+        f"2. Employee count: approximately {employees} employees",
+        f"3. Key products: {company} offers graphic films, wraps and signage substrates",
+        "4. Market position: strategic leader with strong distribution and brand advantage",
+        "5. Growth trajectory: steady growth driven by vehicle wraps and architectural graphics development",
+        "6. Strategic priorities: durability and UV resistance are an opportunity where Tedlar films could benefit outdoor products",
+    ])
+
+def _decision_makers_response(rng: random.Random) -> str:
+    lines = []
+    for i, (title, department) in enumerate(_pick(rng, DECISION_MAKER_TITLES, 3), 1):
+        lines += [
+            f"{i}. {title}",
+            f"- Department: {department}",
+            f"- Relevant because they are responsible for material selection in {department.lower()}",
+            ""
+        ]
+    return "\n".join(lines)
+
+def _rationale_response(company: str) -> str:
+    return (f"{company} is a large graphics & signage manufacturer with revenue well above $100M. "
+            "Its outdoor graphics portfolio needs long-term durability, UV protection and weather resistance, "
+            "which Tedlar's protective films provide.")
+
+def _outreach_response(rng: random.Random, company: str, title: str) -> str:
+    opener = rng.choice(["I enjoyed seeing", "I've been following", "I was impressed by"])
+    return (f"Hi,\n\n{opener} {company}'s work in graphics & signage. As {title or 'a leader'} there, "
+            "you know how much outdoor durability matters. DuPont Tedlar's protective films add UV and weather "
+            "resistance that keeps graphics vivid for years.\n\nWould you be open to a 15-minute call next week?\n\n"
+            "Best regards,\n[Your name]")
+
+def _dossier_response(rng: random.Random, company: str) -> str:
+    titles = _pick(rng, DECISION_MAKER_TITLES, 3)
+    return json.dumps({
+        "estimated_revenue": rng.choice([6.5e8, 1.2e9, 2.5e9, 8.5e9]),
+        "estimated_employees": rng.choice(["1,200", "3,500", "10,000"]),
+        "strategic_insights": "Growing vehicle wrap and architectural graphics business with demand for longer outdoor warranties.",
+        "qualification_rationale": _rationale_response(company),
+        "decision_makers": [
+            {"title": title, "department": department, "relevance": f"Owns material selection in {department.lower()}"}
+            for title, department in titles
+        ],
+        "outreach_message": _outreach_response(rng, company, titles[0][0])
+    })
+
+def _batch_enrichment_response(rng: random.Random, prompt: str) -> str:
+    ids = [int(i) for i in re.findall(r'\[Company (\d+)\]', prompt)]
+    return json.dumps({"companies": [
+        {
+            "id": company_id,
+            "estimated_revenue": rng.choice([6.5e8, 1.2e9, 2.5e9, 8.5e9]),
+            "estimated_employees": rng.choice(["1,200", "3,500", "10,000"]),
+            "strategic_insights": "Strategic growth in outdoor graphics where durable protective films are an advantage."
+        }
+        for company_id in ids
+    ]})
+
+def build_completion(payload: Dict, rng: random.Random) -> str:
+    """Pick a canned response matching the prompt shape of the request"""
+    messages = payload.get("messages", [])
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system").lower()
+    prompt = " ".join(m.get("content", "") for m in messages if m.get("role") == "user")
+    schema_name = (payload.get("response_format") or {}).get("json_schema", {}).get("name")
+    company = _prompt_value(prompt, "Company", "your company")
+
+    if schema_name == "lead_dossier":
+        return _dossier_response(rng, company)
+    if schema_name == "batch_enrichment":
+        return _batch_enrichment_response(rng, prompt)
+    if "industry research" in system:
+        return _events_response(rng)
+    if "market research" in system:
+        return _companies_response(rng)
+    if "decision makers" in system:
+        return _decision_makers_response(rng)
+    if "sales analyst" in system:
+        return _rationale_response(prompt.split(" why ")[-1].split(" is a ")[0].strip() or company)
+    if "outreach" in system:
+        return _outreach_response(rng, company, _prompt_value(prompt, "Position"))
+    return _enrichment_response(rng, company)
+
+def create_app(behaviour: Optional[MockBehaviour] = None) -> FastAPI:
+    """Build the FastAPI app serving /api/v1/chat/completions"""
+    behaviour = behaviour or MockBehaviour()
+    app = FastAPI(title="Mock OpenRouter")
+
+    @app.get("/stats")
+    async def stats():
+        return behaviour.stats
+
+    @app.post("/api/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        behaviour.stats['requests'] += 1
+        headers = behaviour.rate_limit_headers()
+
+        burst_left = behaviour.in_burst()
+        over_limit = behaviour.rpm_limit and len(behaviour.request_times) >= behaviour.rpm_limit
+        if burst_left is not None or over_limit:
+            behaviour.stats['rate_limited'] += 1
+            retry_after = burst_left if burst_left is not None else float(headers['x-ratelimit-reset-requests'][:-1])
+            headers['retry-after'] = str(max(1, int(retry_after + 0.999)))
+            return JSONResponse({"error": {"code": 429, "message": "Rate limit exceeded"}}, status_code=429, headers=headers)
+        behaviour.request_times.append(time.monotonic())
+
+        content = build_completion(payload, behaviour.random)
+        prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in payload.get("messages", []))
+        completion_tokens = _estimate_tokens(content)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        delay = behaviour.latency(completion_tokens)
+
+        if behaviour.random.random() < behaviour.error_rate:
+            behaviour.stats['errors'] += 1
+            await asyncio.sleep(delay / 2)
+            status = behaviour.random.choice([500, 502, 503])
+            return JSONResponse({"error": {"code": status, "message": "Upstream provider error"}}, status_code=status, headers=headers)
+
+        completion_id = f"gen-mock-{behaviour.stats['requests']}"
+        model = payload.get("model", "deepseek/deepseek-chat")
+
+        if payload.get("stream"):
+            behaviour.stats['streams'] += 1
+            return StreamingResponse(
+                _stream_chunks(completion_id, model, content, usage, delay),
+                media_type="text/event-stream",
+                headers=headers
+            )
+
+        await asyncio.sleep(delay)
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        }, headers=headers)
+
+    return app
+
+async def _stream_chunks(completion_id: str, model: str, content: str, usage: Dict, delay: float):
+    """Emit the completion as SSE deltas spread over the response latency"""
+    yield ": OPENROUTER PROCESSING\n\n"
+    words = re.findall(r'\S+\s*', content) or [content]
+    step = delay / max(1, len(words))
+    for word in words:
+        await asyncio.sleep(step)
+        chunk = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                 "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    final = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+             "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+    yield f"data: {json.dumps(final)}\n\n"
+    yield "data: [DONE]\n\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenRouter chat-completions server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=800, help="Median response latency")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape parameter")
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="Extra latency per completion token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 5xx")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Seconds between 429 bursts (0 disables)")
+    parser.add_argument("--burst-duration", type=float, default=5.0, help="Length of each 429 burst in seconds")
+    parser.add_argument("--rpm-limit", type=int, default=0, help="Requests per minute before 429s (0 disables)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible responses and latencies")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    behaviour = MockBehaviour(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        ms_per_token=args.ms_per_token,
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_duration=args.burst_duration,
+        rpm_limit=args.rpm_limit,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(behaviour), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Single-pass extraction of revenue, employee and description facts from HTML pages
+"""
+
+import logging
+import re
+from typing import Dict, Iterator, List, Optional, Union
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Patterns in priority order: the first pattern that matches anywhere on the page wins
+REVENUE_PATTERNS = [
+    r'\$\d+(?:\.\d+)?\s*(?:million|billion)?\s*(?:in\s*)?revenue',
+    r'revenue.*?\$?\d+(?:\.\d+)?\s*(?:million|billion)',
+    r'\d+(?:\.\d+)?\s*(?:million|billion).*(?:revenue|annual)',
+]
+
+EMPLOYEE_PATTERNS = [
+    r'\d+(?:,\d+)*\s*employees?',
+    r'employs?\s*\d+(?:,\d+)*',
+    r'\d+(?:,\d+)*\s*people',
+]
+
+FACT_PATTERNS = {
+    'revenue': REVENUE_PATTERNS,
+    'employees': EMPLOYEE_PATTERNS,
+}
+
+# Each pattern sits in its own zero-width lookahead, so one scan finds every
+# pattern's matches without one fact's match consuming another's text (e.g.
+# "revenue grew with 500 employees to $2 million"). No two patterns can match
+# at the same position, so the alternation never hides one behind another.
+FACT_PATTERN = re.compile(
+    '|'.join(
+        f"(?=(?P<{kind}_{index}>{pattern}))"
+        for kind, patterns in FACT_PATTERNS.items()
+        for index, pattern in enumerate(patterns)
+    ),
+    re.IGNORECASE
+)
+
+# Elements whose text is never rendered
+HIDDEN_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+# Company-like link text on exhibitor pages, and the containers exhibitor names sit in
+COMPANY_NAME_KEYWORDS = ['inc', 'corp', 'llc', 'ltd', 'solutions', 'graphics', 'systems']
+EXHIBITOR_CLASS_PATTERN = re.compile(r'company|exhibitor|sponsor|participant', re.IGNORECASE)
+EXHIBITOR_TAGS = {'div', 'span', 'h3', 'h4'}
+
+_PARSER = etree.HTMLParser(remove_comments=True, remove_pis=True)
+
+def _parse(html: Union[str, bytes], encoding: Optional[str] = None):
+    """Parse a page into an lxml tree
+
+    Raw bytes are decoded with the HTTP charset when one was sent, else lxml
+    honours the page's own meta charset.
+    """
+    if isinstance(html, str):
+        html, encoding = html.encode('utf-8'), 'utf-8'
+    parser = _PARSER
+    if encoding:
+        try:
+            parser = etree.HTMLParser(remove_comments=True, remove_pis=True, encoding=encoding)
+        except LookupError:
+            logger.debug(f"Unknown charset {encoding} - letting lxml detect it")
+    return etree.fromstring(html, parser)
+
+def _parse_or_none(html: Union[str, bytes], encoding: Optional[str] = None):
+    if not html:
+        return None
+    try:
+        return _parse(html, encoding)
+    except Exception as e:
+        logger.error(f"Error parsing page: {str(e)}")
+        return None
+
+def visible_text_nodes(root) -> Iterator[str]:
+    """Yield every rendered text segment in document order, in one walk of the tree"""
+    hidden_depth = 0
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag if isinstance(element.tag, str) else ''
+        if event == 'start':
+            if tag in HIDDEN_TAGS:
+                hidden_depth += 1
+            elif not hidden_depth and element.text:
+                yield element.text
+        else:
+            if tag in HIDDEN_TAGS:
+                hidden_depth -= 1
+            # The tail follows the closing tag, so it belongs to the parent
+            if not hidden_depth and element.tail and element is not root:
+                yield element.tail
+
+def extract_page_facts(html: Union[str, bytes], encoding: Optional[str] = None) -> Dict:
+    """Walk a page's visible text once and return every fact match with its position
+
+    Each match records its kind, the index of the pattern that found it, the
+    matched text, the stripped text node it occurs in, and its character offset
+    in the page's visible text.
+    """
+    facts = {'revenue': [], 'employees': [], 'description': ''}
+    root = _parse_or_none(html, encoding)
+    if root is None:
+        return facts
+
+    offset = 0
+    for text in visible_text_nodes(root):
+        last_end = {}  # pattern -> end of its previous match in this node
+        for match in FACT_PATTERN.finditer(text):
+            name = match.lastgroup
+            value = match.group(name)
+            start = match.start()
+            # Skip the suffixes of a match already reported ("00 employees" in "1,200 employees")
+            if start < last_end.get(name, -1):
+                continue
+            last_end[name] = start + len(value)
+            kind, index = name.rsplit('_', 1)
+            facts[kind].append({
+                'pattern': int(index),
+                'match': value,
+                'text': text.strip(),
+                'position': offset + start
+            })
+        offset += len(text)
+
+    for meta in root.iterfind('.//meta[@name="description"]'):
+        facts['description'] = (meta.get('content') or '')[:500]
+        break
+
+    return facts
+
+def best_match(matches: List[Dict], patterns: Optional[List[int]] = None) -> Optional[Dict]:
+    """The match of the highest-priority pattern, earliest on the page, optionally limited to some patterns"""
+    candidates = [match for match in matches if patterns is None or match['pattern'] in patterns]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda match: (match['pattern'], match['position']))
+
+def _element_text(element) -> str:
+    """An element's text with whitespace-only runs between tags collapsed, as BeautifulSoup's get_text does"""
+    return ''.join(
+        '\n' if not text.strip() and '\n' in text else text
+        for text in element.itertext()
+    ).strip()
+
+def extract_exhibitor_names(html: Union[str, bytes], encoding: Optional[str] = None) -> List[str]:
+    """Company names on an event page: company-like link text and exhibitor/sponsor containers"""
+    root = _parse_or_none(html, encoding)
+    if root is None:
+        return []
+
+    links, containers = [], []
+    for element in root.iter('a', *EXHIBITOR_TAGS):
+        if element.tag == 'a':
+            if element.get('href') is None:
+                continue
+            text = _element_text(element)
+            if 3 < len(text) < 100 and any(keyword in text.lower() for keyword in COMPANY_NAME_KEYWORDS):
+                links.append(text)
+        elif any(EXHIBITOR_CLASS_PATTERN.search(name) for name in (element.get('class') or '').split()):
+            text = _element_text(element)
+            if 3 < len(text) < 100:
+                containers.append(text)
+
+    return links + containers
+
+def find_link(html: Union[str, bytes], href_pattern: str, encoding: Optional[str] = None) -> Optional[str]:
+    """The first link whose href matches a pattern"""
+    root = _parse_or_none(html, encoding)
+    if root is None:
+        return None
+
+    pattern = re.compile(href_pattern)
+    for link in root.iter('a'):
+        href = link.get('href')
+        if href and pattern.search(href):
+            return href
+    return None
+
+def find_text(html: Union[str, bytes], text_pattern: str, encoding: Optional[str] = None) -> Optional[str]:
+    """The first visible text node matching a pattern (case-insensitive), stripped"""
+    root = _parse_or_none(html, encoding)
+    if root is None:
+        return None
+
+    pattern = re.compile(text_pattern, re.IGNORECASE)
+    for text in visible_text_nodes(root):
+        if pattern.search(text):
+            return text.strip()
+    return None
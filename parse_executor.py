@@ -0,0 +1,78 @@
+"""
+Process pool for CPU-bound HTML parsing, kept off the asyncio event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class ParseExecutor:
+    """Runs parse functions in worker processes so parsing never blocks network I/O
+
+    Callers pass raw page bytes to a module-level function (see page_extractor) and
+    get its extracted facts back; only bytes and small results cross the process
+    boundary. With 0 workers everything runs inline on the loop, as before.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(0, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self.tasks = 0
+        self.inline_tasks = 0
+        self.failures = 0
+        self.pool_restarts = 0
+        self.total_time = 0.0
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # forkserver children do not inherit the loop's threads, sockets or SQLite handles
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run func(*args) in a worker process; a crashed pool is rebuilt for the next call"""
+        started = time.monotonic()
+        self.tasks += 1
+        try:
+            if not self.workers:
+                self.inline_tasks += 1
+                return func(*args)
+
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._ensure_pool(), func, *args)
+            except BrokenProcessPool:
+                # Not retried inline: a page that kills a worker would take the loop down with it
+                logger.error("Parse worker pool crashed - restarting it")
+                self.failures += 1
+                self.pool_restarts += 1
+                self.shutdown()
+                raise
+        finally:
+            self.total_time += time.monotonic() - started
+
+    def shutdown(self):
+        """Stop the worker processes without waiting for queued parses"""
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'tasks': self.tasks,
+            'inline_tasks': self.inline_tasks,
+            'failures': self.failures,
+            'pool_restarts': self.pool_restarts,
+            'avg_latency': round(self.total_time / self.tasks, 4) if self.tasks else 0.0
+        }
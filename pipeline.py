@@ -0,0 +1,114 @@
+"""
+Staged async pipeline with bounded queues between stages
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker passed between stages
+_DONE = object()
+
+class Stage:
+    """One pipeline stage: an async function applied to every item
+
+    The function returns the (possibly updated) item, or None to drop it.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Awaitable[Optional[Any]]], concurrency: int = 1):
+        self.name = name
+        self.func = func
+        self.concurrency = max(1, concurrency)
+
+        # Metrics
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'concurrency': self.concurrency,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'busy_time': round(self.busy_time, 3)
+        }
+
+class Pipeline:
+    """Runs items through stages connected by bounded asyncio queues
+
+    Each stage has its own worker pool. A full queue blocks the upstream stage
+    (backpressure), so throughput is set by the slowest stage while the others
+    overlap with it. Finished items are yielded as soon as they leave the last stage.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 10):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, items: Iterable) -> AsyncIterator[Any]:
+        """Feed items through every stage, yielding finished items in completion order"""
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        tasks = [asyncio.create_task(self._feed(items, queues[0], self.stages[0].concurrency))]
+        for index, stage in enumerate(self.stages):
+            next_workers = self.stages[index + 1].concurrency if index + 1 < len(self.stages) else 1
+            tasks.append(asyncio.create_task(self._run_stage(stage, queues[index], queues[index + 1], next_workers)))
+
+        output = queues[-1]
+        try:
+            while True:
+                item = await output.get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            # Consumer finished or stopped early: tear down every stage
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _feed(self, items: Iterable, queue: asyncio.Queue, workers: int):
+        for item in items:
+            await queue.put(item)
+        for _ in range(workers):
+            await queue.put(_DONE)
+
+    async def _run_stage(self, stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue, next_workers: int):
+        await asyncio.gather(*[self._worker(stage, inbox, outbox) for _ in range(stage.concurrency)])
+        for _ in range(next_workers):
+            await outbox.put(_DONE)
+
+    async def _worker(self, stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue):
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+
+            started = time.monotonic()
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                # Failures stay isolated to the item
+                stage.errors += 1
+                logger.error(f"Pipeline stage '{stage.name}' failed: {str(e)}")
+                result = None
+            finally:
+                stage.busy_time += time.monotonic() - started
+
+            if result is None:
+                stage.dropped += 1
+                continue
+
+            stage.processed += 1
+            await outbox.put(result)
+
+    def stats(self) -> Dict:
+        """Per-stage throughput counters"""
+        return {stage.name: stage.stats() for stage in self.stages}
@@ -0,0 +1,234 @@
+"""
+Adaptive rate limiting and concurrency control for the OpenRouter endpoint
+"""
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Decreases closer together than this are treated as one congestion event
+DECREASE_COOLDOWN = 1.0
+
+def estimate_tokens(messages: List[Dict], max_tokens: int = 0) -> int:
+    """Rough token estimate for a chat request (about 4 characters per token)"""
+    chars = sum(len(str(message.get('content', ''))) for message in messages)
+    return chars // 4 + max_tokens
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_minute / 60.0)
+        self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.rate_per_minute
+
+    def consume(self, amount: float):
+        """Take tokens from the bucket; the balance may go negative to record debt"""
+        self._refill()
+        self.tokens -= amount
+
+    def set_rate(self, rate_per_minute: float):
+        """Adopt a new rate, e.g. the limit advertised by the provider"""
+        self._refill()
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute
+        self.tokens = min(self.tokens, self.capacity)
+
+class AdaptiveRateLimiter:
+    """Requests/tokens per minute buckets plus AIMD concurrency control
+
+    Every request waits for both buckets and a concurrency slot. Successful responses
+    grow the concurrency limit additively; 429/503 responses halve it and honour any
+    Retry-After or rate-limit reset header before new requests are admitted.
+    """
+
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: int = 200000,
+                 initial_concurrency: int = 4, min_concurrency: int = 1, max_concurrency: int = 32,
+                 decrease_factor: float = 0.5):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self.concurrency_limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._admission_lock = asyncio.Lock()
+        self._slot_available = asyncio.Condition()
+
+        # Metrics
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0):
+        """Hold a rate-limited request slot for the duration of the block"""
+        await self.acquire(estimated_tokens)
+        try:
+            yield self
+        finally:
+            await self.release()
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """Wait for a concurrency slot and enough request/token budget"""
+        started = time.monotonic()
+
+        async with self._slot_available:
+            await self._slot_available.wait_for(lambda: self.in_flight < int(self.concurrency_limit))
+            self.in_flight += 1
+
+        try:
+            # Admit requests one at a time so waiting callers are served in order
+            async with self._admission_lock:
+                while True:
+                    wait = max(
+                        self.blocked_until - time.monotonic(),
+                        self.request_bucket.time_until(1),
+                        self.token_bucket.time_until(estimated_tokens)
+                    )
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+
+                self.request_bucket.consume(1)
+                self.token_bucket.consume(estimated_tokens)
+        except BaseException:
+            await self.release()
+            raise
+
+        self.wait_time += time.monotonic() - started
+
+    async def release(self):
+        """Return a concurrency slot"""
+        async with self._slot_available:
+            self.in_flight -= 1
+            self._slot_available.notify_all()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Correct the token bucket once the real usage is known"""
+        if actual_tokens is not None:
+            self.token_bucket.consume(actual_tokens - estimated_tokens)
+
+    def record_response(self, status_code: int, headers: Optional[Mapping[str, str]] = None):
+        """Adapt concurrency and pacing to the provider's response"""
+        headers = headers or {}
+        self._apply_rate_limit_headers(headers)
+
+        if status_code in (429, 503):
+            self.throttled += 1
+            retry_after = self._parse_retry_after(headers.get('retry-after'))
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self._decrease()
+        elif status_code < 500:
+            self._increase()
+
+    def _increase(self):
+        # Additive increase: roughly +1 slot per full window of successes
+        # (waiters are woken when the slot is released)
+        self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1.0 / self.concurrency_limit)
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit * self.decrease_factor)
+        logger.warning(f"Rate limited by provider - concurrency reduced to {int(self.concurrency_limit)}")
+
+    def _apply_rate_limit_headers(self, headers: Mapping[str, str]):
+        """Read OpenAI-style and OpenRouter-style rate limit headers"""
+        limit_requests = self._parse_number(headers.get('x-ratelimit-limit-requests'))
+        if limit_requests:
+            self.request_bucket.set_rate(limit_requests)
+
+        limit_tokens = self._parse_number(headers.get('x-ratelimit-limit-tokens'))
+        if limit_tokens:
+            self.token_bucket.set_rate(limit_tokens)
+
+        for remaining_header, reset_header in (
+            ('x-ratelimit-remaining-requests', 'x-ratelimit-reset-requests'),
+            ('x-ratelimit-remaining-tokens', 'x-ratelimit-reset-tokens'),
+            ('x-ratelimit-remaining', 'x-ratelimit-reset'),
+        ):
+            remaining = self._parse_number(headers.get(remaining_header))
+            if remaining is not None and remaining <= 0:
+                reset_in = self._parse_reset(headers.get(reset_header))
+                if reset_in:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + reset_in)
+
+    @staticmethod
+    def _parse_number(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delta-seconds or an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _parse_reset(value: Optional[str]) -> Optional[float]:
+        """Reset headers come as durations ("6m0s", "20ms"), seconds, or epoch timestamps"""
+        if not value:
+            return None
+        try:
+            number = float(value)
+            if number > 1e12:  # epoch milliseconds (OpenRouter)
+                return max(0.0, number / 1000 - time.time())
+            if number > 1e9:  # epoch seconds
+                return max(0.0, number - time.time())
+            return max(0.0, number)
+        except ValueError:
+            pass
+
+        units = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+        parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+        if not parts:
+            return None
+        return sum(float(amount) * units[unit] for amount, unit in parts)
+
+    def stats(self) -> Dict:
+        """Return current limits and throttling counters"""
+        return {
+            'concurrency_limit': int(self.concurrency_limit),
+            'in_flight': self.in_flight,
+            'requests_per_minute': self.request_bucket.rate_per_minute,
+            'tokens_per_minute': self.token_bucket.rate_per_minute,
+            'throttled': self.throttled,
+            'wait_time': round(self.wait_time, 2)
+        }
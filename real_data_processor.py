@@ -5,19 +5,90 @@ AI lead processor
 import asyncio
 import logging
 import re
-from typing import List, Dict, Optional
+from typing import Awaitable, Callable, List, Dict, Optional
 import aiohttp
-from bs4 import BeautifulSoup
+
+from budget import RunBudget, current_budget
+from entity_resolution import EntityResolver
+from page_extractor import extract_exhibitor_names
+from run_journal import RUN_LEVEL, RunJournal
+from scheduler import PriorityScheduler
+from validation import LeadQualificationGate
 
 logger = logging.getLogger(__name__)
 
+# Stages a lead goes through, used to report how complete a partial lead is
+LEAD_STAGES = ['scrape', 'enrichment', 'rationale', 'decision_makers', 'outreach']
+
 class RealDataLeadProcessor:
-    def __init__(self, scraper, deepseek_client):
+    def __init__(self, scraper, deepseek_client, config=None, journal: Optional[RunJournal] = None,
+                 entity_resolver: Optional[EntityResolver] = None):
         self.scraper = scraper
         self.deepseek_client = deepseek_client
+        self.config = config
+        self.use_dossier = config.use_lead_dossier if config else True
+        self.discovery_concurrency = max(1, config.discovery_concurrency if config else 3)
+        self.qualification_gate = LeadQualificationGate(config)
+        self.journal = journal if journal is not None else self._build_journal()
+        self.entity_resolver = entity_resolver if entity_resolver is not None else self._build_entity_resolver()
+
+    def _build_entity_resolver(self) -> EntityResolver:
+        """Create the company entity resolver described by the config"""
+        if not self.config:
+            return EntityResolver()
+
+        try:
+            return EntityResolver(self.config.entity_store_path or None, self.config.entity_similarity_threshold)
+        except Exception as e:
+            logger.error(f"Could not open entity store: {str(e)}")
+            return EntityResolver(None, self.config.entity_similarity_threshold)
+
+    def _build_journal(self) -> Optional[RunJournal]:
+        """Open the run journal described by the config"""
+        if self.config and not self.config.run_journal_enabled:
+            return None
+
+        try:
+            return RunJournal(self.config.run_journal_path) if self.config else RunJournal()
+        except Exception as e:
+            logger.error(f"Could not open run journal: {str(e)}")
+            return None
+
+    async def _checkpoint(self, run_id: Optional[str], company_key: str, stage: str,
+                          compute: Callable[[], Awaitable]):
+        """Return a stage's journalled output for this run, or compute and journal it"""
+        if not (self.journal and run_id):
+            return await compute()
+
+        saved = self.journal.load(run_id, company_key, stage)
+        if saved is not None:
+            logger.info(f"Run {run_id}: reusing {stage} checkpoint for {company_key}")
+            return saved
+
+        result = await compute()
+        # A scrape that failed outright comes back as a dict carrying its error
+        failed = isinstance(result, dict) and result.get('error')
+        if result is not None and not failed and self._journal_writable():
+            self.journal.save(run_id, company_key, stage, result)
+        return result
+
+    async def _stage(self, run_id: Optional[str], company_key: str, stage: str, compute: Callable[[], Awaitable]):
+        """Run a checkpointed lead stage; None if it failed, so no fallback is journalled or counted as done"""
+        try:
+            return await self._checkpoint(run_id, company_key, stage, compute)
+        except Exception as e:
+            logger.error(f"Stage {stage} failed for {company_key}: {str(e)}")
+            return None
 
-    async def research_events_with_ai(self, industry: str = "Graphics & Signage") -> List[Dict]:
-        """Use AI to identify relevant industry events"""
+    @staticmethod
+    def _journal_writable() -> bool:
+        """Fallback results produced after the budget ran out must not be replayed on resume"""
+        budget = current_budget()
+        return not (budget and budget.exhausted_reason)
+
+    async def research_events_with_ai(self, industry: str = "Graphics & Signage",
+                                      raise_on_error: bool = False) -> List[Dict]:
+        """Use AI to identify relevant industry events (none on failure, unless raise_on_error)"""
         try:
             logger.info(f"Using AI to research events for {industry}")
             
@@ -34,37 +105,27 @@ class RealDataLeadProcessor:
             """
             
             # Call DeepSeek API
-            import httpx
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.deepseek_client.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.deepseek_client.model,
-                        "messages": [
-                            {"role": "system", "content": "You are an industry research specialist."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1500
-                    }
-                )
+            result = await self.deepseek_client.chat(
+                [
+                    {"role": "system", "content": "You are an industry research specialist."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=1500,
+                call_type="event_research"
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                events_text = result["choices"][0]["message"]["content"]
-                
-                # Parse the AI response to extract events
-                events = self._parse_events_from_ai(events_text)
-                logger.info(f"AI identified {len(events)} events")
-                return events
-            else:
-                logger.error(f"AI event research failed: {response.status_code}")
-                return []
+            events_text = result["choices"][0]["message"]["content"]
+
+            # Parse the AI response to extract events
+            events = self._parse_events_from_ai(events_text)
+            logger.info(f"AI identified {len(events)} events")
+            return events
                 
         except Exception as e:
             logger.error(f"Error in AI event research: {str(e)}")
+            if raise_on_error:
+                raise
             return []
 
     def _parse_events_from_ai(self, ai_text: str) -> List[Dict]:
@@ -120,26 +181,11 @@ class RealDataLeadProcessor:
             
             for url in search_urls:
                 try:
-                    async with self.scraper.session.get(url, timeout=10) as response:
+                    async with self.scraper._get(url, timeout=10) as response:
                         if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'lxml')
-                            
-                            # Look for company names in various patterns
-                            # Pattern 1: Links with company-like text
-                            for link in soup.find_all('a', href=True):
-                                text = link.get_text().strip()
-                                if text and len(text) > 3 and len(text) < 100:
-                                    # Filter for company-like names
-                                    if any(keyword in text.lower() for keyword in ['inc', 'corp', 'llc', 'ltd', 'solutions', 'graphics', 'systems']):
-                                        companies.append(text)
-                            
-                            # Pattern 2: Divs or spans with company class names
-                            for elem in soup.find_all(['div', 'span', 'h3', 'h4'], class_=re.compile(r'company|exhibitor|sponsor|participant', re.I)):
-                                text = elem.get_text().strip()
-                                if text and len(text) > 3 and len(text) < 100:
-                                    companies.append(text)
-                            
+                            # Company-like link text, then exhibitor/sponsor containers (parsed off the loop)
+                            companies.extend(await self.scraper.parse(response, extract_exhibitor_names))
+
                             if companies:
                                 break  # Found companies, stop searching
                                 
@@ -158,8 +204,9 @@ class RealDataLeadProcessor:
             logger.error(f"Error scraping exhibitors: {str(e)}")
             return []
 
-    async def find_companies_with_ai(self, industry: str, event_context: str = "") -> List[Dict]:
-        """Use AI to identify companies in the industry"""
+    async def find_companies_with_ai(self, industry: str, event_context: str = "",
+                                     raise_on_error: bool = False) -> List[Dict]:
+        """Use AI to identify companies in the industry (none on failure, unless raise_on_error)"""
         try:
             logger.info(f"Using AI to find companies in {industry}")
             
@@ -207,34 +254,25 @@ class RealDataLeadProcessor:
             Events: ISA Sign Expo, Labelexpo, PRINTING United
             """
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.deepseek_client.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.deepseek_client.model,
-                        "messages": [
-                            {"role": "system", "content": "You are a B2B market research specialist."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 2000
-                    }
-                )
+            result = await self.deepseek_client.chat(
+                [
+                    {"role": "system", "content": "You are a B2B market research specialist."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3,
+                max_tokens=2000,
+                call_type="company_discovery"
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                companies_text = result["choices"][0]["message"]["content"]
-                companies = self._parse_companies_from_ai(companies_text)
-                logger.info(f"AI identified {len(companies)} companies")
-                return companies
-            else:
-                logger.error(f"AI company research failed: {response.status_code}")
-                return []
+            companies_text = result["choices"][0]["message"]["content"]
+            companies = self._parse_companies_from_ai(companies_text)
+            logger.info(f"AI identified {len(companies)} companies")
+            return companies
                 
         except Exception as e:
             logger.error(f"Error in AI company research: {str(e)}")
+            if raise_on_error:
+                raise
             return []
 
     def _parse_companies_from_ai(self, ai_text: str) -> List[Dict]:
@@ -271,7 +309,8 @@ class RealDataLeadProcessor:
                         current_company['estimated_revenue'] = value * 1000000
                 
                 # Extract employee count
-                emp_match = re.search(r'(\d+(?:,\d+)*)\s*(?:employees?|people)', line, re.I)
+                emp_match = re.search(r'(\d+(?:,\d+)*)\s*(?:employees?|people)', line, re.I) or \
+                    re.search(r'^employees:\s*~?(\d+(?:,\d+)*)', line, re.I)
                 if emp_match:
                     current_company['employees'] = int(emp_match.group(1).replace(',', ''))
                 
@@ -282,6 +321,10 @@ class RealDataLeadProcessor:
                 elif re.search(r'www\.[^\s]+', line):
                     current_company['website'] = 'https://' + re.search(r'www\.[^\s]+', line).group(0)
                 
+                # Extract products
+                if line.lower().startswith('products:'):
+                    current_company['products'] = re.sub(r'^products:\s*', '', line, flags=re.I)
+                
                 # Extract events
                 if line.lower().startswith('events:'):
                     events_text = re.sub(r'^events:\s*', '', line, flags=re.I)
@@ -312,89 +355,443 @@ class RealDataLeadProcessor:
         logger.info(f"Validated {len(validated_companies)} companies with proper revenue data")
         return validated_companies
 
-    async def generate_real_leads(self, industry: str = "Graphics & Signage", max_results: int = 20) -> List[Dict]:
-        """Generate leads using only real data sources"""
+    async def generate_real_leads(self, industry: str = "Graphics & Signage", max_results: int = 20,
+                                  on_outreach_delta: Optional[Callable[[Dict, str], None]] = None,
+                                  on_lead: Optional[Callable[[Dict], None]] = None,
+                                  run_id: Optional[str] = None,
+                                  on_top_k: Optional[Callable[[List[Dict]], None]] = None,
+                                  stop_at_top_k: Optional[bool] = None,
+                                  budget: Optional[RunBudget] = None,
+                                  on_progress: Optional[Callable[[str, Dict], None]] = None,
+                                  raise_on_error: bool = False) -> List[Dict]:
+        """Generate leads using only real data sources, highest expected value first
+
+        on_outreach_delta(lead, text_so_far) receives the outreach message as it streams
+        (it then gets its own call, and the dossier covers the rest of the lead);
+        on_lead(lead) is called as soon as each lead is complete and on_top_k(leads)
+        whenever the best `lead_top_k` finished leads change. With stop_at_top_k the
+        run returns once those can no longer be outranked.
+        With a run_id every stage is checkpointed in the run journal, and calling again
+        with the same run_id after an interruption skips the work already done.
+        Every scraper and LLM request is charged to the run budget (by default built
+        from the config); when it runs out, in-flight work is cancelled and the leads
+        processed so far are returned. Each lead carries 'completed_stages' and a
+        'completeness' fraction.
+        on_progress(stage, info) reports run milestones: events researched, companies
+        discovered, each company scraped and the budget running out.
+        If the run fails, no leads are returned, or the error is raised with raise_on_error.
+        """
+        budget = budget or self._build_budget()
+        progress = {'scheduler': None, 'partials': {}, 'on_progress': on_progress, 'failed_stages': []}
+        token = budget.activate()
+        work = None
         try:
             logger.info(f"Generating real leads for {industry}")
-            
-            # Step 1: Research events with AI
-            events = await self.research_events_with_ai(industry)
-            
-            # Step 2: Find companies with AI
-            all_companies = []
-            for event in events[:3]:  # Use top 3 events for context
-                companies = await self.find_companies_with_ai(industry, event.get('name', ''))
-                all_companies.extend(companies)
-            
-            # Remove duplicates
-            unique_companies = {}
-            for company in all_companies:
-                name = company['name'].lower()
-                if name not in unique_companies:
-                    unique_companies[name] = company
-            
-            companies = list(unique_companies.values())[:max_results]
-            
-            # Step 3: Enrich with real web scraping
-            logger.info(f"Scraping real data for {len(companies)} companies")
-            enriched_companies = []
-            
-            for company in companies:
-                try:
-                    # Real web scraping
-                    scraped_data = await self.scraper.get_company_data(
-                        company['name'], 
-                        company.get('website', '')
-                    )
-                    
-                    # Merge AI and scraped data
-                    merged = {**company, **scraped_data}
-                    
-                    # AI enrichment
-                    enriched = await self.deepseek_client.enrich_company_data(merged)
-                    
-                    # Generate qualification rationale with AI
-                    enriched['qualification_rationale'] = await self._generate_ai_rationale(enriched)
-                    
-                    # Identify decision makers with AI
-                    decision_makers = await self.deepseek_client.identify_decision_makers(enriched)
-                    enriched['decision_makers'] = decision_makers
-                    
-                    # Generate contacts (this would use LinkedIn/Clay in production)
-                    enriched['contacts'] = self._generate_contacts_from_decision_makers(
-                        decision_makers, 
-                        enriched['company_name']
-                    )
-                    
-                    # Generate personalized outreach with AI
-                    if enriched.get('contacts'):
-                        primary_contact = enriched['contacts'][0]
-                        lead_data = {
-                            'company_name': enriched['company_name'],
-                            'contact_name': primary_contact.get('name', 'Decision Maker'),
-                            'contact_title': primary_contact.get('title', ''),
-                            'industry': enriched.get('industry', industry),
-                            'employees': enriched.get('employees', 'Unknown'),
-                            'qualification_rationale': enriched.get('qualification_rationale', '')
-                        }
-                        enriched['outreach_message'] = await self.deepseek_client.generate_outreach_message(lead_data)
-                        enriched['primary_contact'] = primary_contact
-                    
-                    enriched_companies.append(enriched)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {company['name']}: {str(e)}")
-                    continue
-            
-            logger.info(f"Generated {len(enriched_companies)} real leads")
-            return enriched_companies
+            self.deepseek_client.start_run()
+            if self.journal and run_id:
+                self.journal.start_run(run_id, industry, {'max_results': max_results})
+
+            work = asyncio.create_task(self._generate_leads(
+                industry, max_results, on_outreach_delta, on_lead, run_id, on_top_k, stop_at_top_k, progress
+            ))
+            exhausted = asyncio.create_task(budget.wait_exhausted())
+            try:
+                await asyncio.wait({work, exhausted}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                exhausted.cancel()
+
+            finished = work.done()
+            if finished:
+                leads = work.result()
+            else:
+                # Budget ran out: stop everything still running and keep what is done.
+                # The journal run stays open so it can be resumed with a fresh budget.
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+                leads = self._collect_partial_leads(progress)
+                if budget.late_charges:
+                    logger.warning(f"{budget.late_charges} LLM calls finished after the run budget ran out")
+                self._report(progress, 'budget_exhausted', reason=budget.exhausted_reason)
+                logger.warning(f"Run budget exhausted ({budget.exhausted_reason}) - "
+                               f"returning {len(leads)} leads processed so far")
+
+            for lead in leads:
+                self._flag_completeness(lead)
+
+            # Closing the journal run drops its checkpoints, so only do it once every lead and run stage is whole;
+            # otherwise a rerun resumes and retries just the stages that fell back
+            if self.journal and run_id and finished:
+                if all(lead['completeness'] == 1 for lead in leads) and not progress['failed_stages']:
+                    self.journal.finish_run(run_id)
+                else:
+                    logger.warning(f"Run {run_id} has incomplete leads or failed stages - keeping its checkpoints for a rerun")
+
+            logger.info(f"Generated {len(leads)} real leads - budget: {budget.stats()}")
+            return leads
             
         except Exception as e:
             logger.error(f"Error generating real leads: {str(e)}")
+            if raise_on_error:
+                raise
             return []
+        finally:
+            # If the caller was cancelled, stop the work too instead of leaving it spending the budget
+            if work and not work.done():
+                work.cancel()
+                await asyncio.gather(work, return_exceptions=True)
+            budget.deactivate(token)
+
+    async def _generate_leads(self, industry: str, max_results: int,
+                              on_outreach_delta: Optional[Callable[[Dict, str], None]],
+                              on_lead: Optional[Callable[[Dict], None]],
+                              run_id: Optional[str],
+                              on_top_k: Optional[Callable[[List[Dict]], None]],
+                              stop_at_top_k: Optional[bool],
+                              progress: Dict) -> List[Dict]:
+        """Research, discovery and lead processing; progress exposes partial results"""
+        # Step 1: Research events with AI (a failed search is not journalled, so a rerun retries it)
+        events = await self._stage(run_id, RUN_LEVEL, 'events',
+                                   lambda: self.research_events_with_ai(industry, raise_on_error=True))
+        if events is None:
+            progress['failed_stages'].append('events')
+            events = []
+        self._report(progress, 'events', events=[event.get('name', '') for event in events])
+        
+        # Step 2: Find companies with AI across all events concurrently
+        companies = await self._discover_companies(industry, events, max_results, run_id, progress)
+        self._report(progress, 'discovery', companies=[company['name'] for company in companies])
+        
+        # Step 3: Scrape and enrich concurrently, most valuable companies first
+        for company in companies:
+            company['priority_score'] = self._expected_value(company, events)
+        companies = sorted(companies, key=lambda c: c['priority_score'], reverse=True)[:max_results]
+        
+        if stop_at_top_k is None:
+            stop_at_top_k = self.config.stop_at_top_k if self.config else False
+        
+        workers = self._lead_worker_count()
+        logger.info(f"Processing {len(companies)} companies with {workers} workers")
+        scheduler = PriorityScheduler(
+            workers=workers,
+            top_k=self.config.lead_top_k if self.config else 5,
+            stop_at_top_k=stop_at_top_k,
+            on_top_k=on_top_k
+        )
+        progress['scheduler'] = scheduler
+        
+        # Finished leads come back highest priority first; failed companies are dropped
+        enriched_companies = await scheduler.run(
+            [(company['priority_score'], company) for company in companies],
+            lambda company: self._process_company(company, industry, on_outreach_delta, on_lead, run_id, progress)
+        )
+        logger.info(f"Scheduler: {scheduler.stats()}")
+        return enriched_companies
+
+    @staticmethod
+    def _report(progress: Optional[Dict], stage: str, **info):
+        """Pass a run milestone to the on_progress callback, if any"""
+        if progress and progress.get('on_progress'):
+            try:
+                progress['on_progress'](stage, info)
+            except Exception as e:
+                logger.error(f"Progress callback failed for {stage}: {str(e)}")
+
+    def _build_budget(self) -> RunBudget:
+        """Run budget described by the config; unlimited without one"""
+        if not self.config:
+            return RunBudget()
+        return RunBudget(
+            deadline_seconds=self.config.run_deadline_seconds,
+            max_tokens=self.config.run_max_tokens,
+            max_requests=self.config.run_max_requests
+        )
+
+    def _collect_partial_leads(self, progress: Dict) -> List[Dict]:
+        """Finished leads, then any company that got at least as far as scraping"""
+        scheduler = progress['scheduler']
+        finished = scheduler.results() if scheduler else []
+        finished_keys = {self._company_key(lead) for lead in finished}
+
+        unfinished = [lead for key, lead in progress['partials'].items() if key not in finished_keys]
+        unfinished.sort(key=lambda lead: lead.get('priority_score', 0), reverse=True)
+        return finished + unfinished
+
+    @staticmethod
+    def _flag_completeness(lead: Dict):
+        """Record how much of the lead pipeline a lead went through"""
+        completed = lead.setdefault('completed_stages', [])
+        lead['completeness'] = round(len([s for s in LEAD_STAGES if s in completed]) / len(LEAD_STAGES), 2)
 
-    async def _generate_ai_rationale(self, company: Dict) -> str:
-        """Generate qualification rationale using AI"""
+    async def _discover_companies(self, industry: str, events: List[Dict], max_results: int,
+                                  run_id: Optional[str] = None, progress: Optional[Dict] = None) -> List[Dict]:
+        """Fan company discovery out over every event and merge results as they arrive
+
+        Companies failing the qualification gate are dropped on arrival. At most
+        `discovery_concurrency` events are searched at once, in research order; once
+        enough unique qualified companies have been found, discovery stops and the
+        queued and in-flight calls are cancelled.
+        Each event's search is checkpointed on its own, so a rerun repeats only
+        the searches that failed.
+        """
+        contexts = [event.get('name', '') for event in events] or ['']
+        slots = asyncio.Semaphore(self.discovery_concurrency)
+
+        async def discover(context: str) -> List[Dict]:
+            async with slots:
+                stage = f'companies:{context}'
+                found = await self._stage(run_id, RUN_LEVEL, stage,
+                                          lambda: self.find_companies_with_ai(industry, context, raise_on_error=True))
+                if found is None and progress is not None:
+                    progress['failed_stages'].append(stage)
+                return found or []
+
+        tasks = [asyncio.create_task(discover(context)) for context in contexts]
+
+        unique_companies = {}
+        rejected = set()
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for company in await next_done:
+                    entity_id = self.entity_resolver.resolve(company['name'], company.get('website', ''))
+                    if entity_id in rejected:
+                        continue
+                    if entity_id not in unique_companies:
+                        if self.qualification_gate.qualifies(company):
+                            unique_companies[entity_id] = {**company, 'entity_id': entity_id}
+                        else:
+                            rejected.add(entity_id)
+                    else:
+                        # Same company listed under another event or another name
+                        self.entity_resolver.merge_into(unique_companies[entity_id], company)
+
+                if len(unique_companies) >= max_results:
+                    logger.info(f"Found {len(unique_companies)} qualified companies - stopping discovery early")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancellations, so no discovery call is still charging the budget
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info(f"Qualification gate: {self.qualification_gate.stats()}")
+        logger.info(f"Entity resolution: {self.entity_resolver.stats()}")
+        return list(unique_companies.values())
+
+    @staticmethod
+    def _expected_value(company: Dict, events: List[Dict]) -> float:
+        """Priority of a company: revenue, weighted up for each researched event it attends"""
+        event_words = [set(re.findall(r'\w+', event.get('name', '').lower())) for event in events]
+
+        overlap = 0
+        for attending in company.get('events_attending', []):
+            words = set(re.findall(r'\w+', attending.lower()))
+            # An event matches when most of its words appear in a researched event name
+            if words and any(len(words & researched) * 2 > len(words) for researched in event_words):
+                overlap += 1
+
+        return (company.get('estimated_revenue', 0) or 0) * (1 + overlap)
+
+    @staticmethod
+    def _company_key(company: Dict) -> str:
+        """Journal key of a company: its resolved entity ID where known"""
+        return company.get('entity_id') or company['name'].lower()
+
+    def _lead_worker_count(self) -> int:
+        """Concurrent companies, bounded by the scrape and LLM concurrency limits"""
+        if not self.config:
+            return 5
+        if self.config.max_concurrent_leads:
+            return self.config.max_concurrent_leads
+        return max(1, min(self.config.max_concurrent_scrapes, self.config.deepseek_max_concurrency))
+
+    async def _process_company(self, company: Dict, industry: str,
+                               on_outreach_delta: Optional[Callable[[Dict, str], None]] = None,
+                               on_lead: Optional[Callable[[Dict], None]] = None,
+                               run_id: Optional[str] = None,
+                               progress: Optional[Dict] = None) -> Optional[Dict]:
+        """Scrape and enrich one company; returns None if it fails
+
+        The lead is registered in the run's partial leads as soon as it is scraped,
+        so a run cut short by its budget can still return it.
+        """
+        try:
+            key = self._company_key(company)
+
+            # A lead finished before the interruption is replayed from the journal
+            finished = self.journal.load(run_id, key, 'lead') if self.journal and run_id else None
+            if finished:
+                if on_outreach_delta and finished.get('outreach_message'):
+                    on_outreach_delta(finished, finished['outreach_message'])
+                if on_lead:
+                    on_lead(finished)
+                return finished
+
+            # Real web scraping
+            scraped_data = await self._checkpoint(run_id, key, 'scraped', lambda: self.scraper.get_company_data(
+                company['name'],
+                company.get('website', '')
+            ))
+
+            # Merge AI and scraped data
+            merged = {**company, **scraped_data, 'completed_stages': ['scrape']}
+            if progress is not None:
+                progress['partials'][key] = merged
+                self._report(progress, 'scraped', company=merged.get('company_name', company['name']))
+
+            # One structured completion per lead, per-step calls as fallback. A JSON dossier
+            # cannot stream its outreach message, so callers watching it stream get the rest
+            # from the dossier and the outreach from its own streamed call
+            dossier = None
+            if self.use_dossier:
+                dossier = await self._checkpoint(run_id, key, 'dossier', lambda: self.deepseek_client.generate_lead_dossier(
+                    merged, include_outreach=not on_outreach_delta
+                ))
+
+            if dossier:
+                enriched = self._apply_dossier(merged, dossier)
+                if enriched.get('contacts') and 'outreach' not in enriched['completed_stages']:
+                    await self._add_outreach(enriched, industry, on_outreach_delta)
+            else:
+                enriched = await self._enrich_step_by_step(merged, industry, on_outreach_delta, run_id)
+
+            # Only a whole lead is replayed as finished; a degraded one reruns its missing stages
+            complete = all(stage in enriched['completed_stages'] for stage in LEAD_STAGES)
+            if self.journal and run_id and complete and self._journal_writable():
+                self.journal.save(run_id, key, 'lead', enriched)
+
+            if on_lead:
+                on_lead(enriched)
+            return enriched
+
+        except Exception as e:
+            logger.error(f"Error processing {company['name']}: {str(e)}")
+            return None
+
+    async def _enrich_step_by_step(self, merged: Dict, industry: str,
+                                   on_outreach_delta: Optional[Callable[[Dict, str], None]] = None,
+                                   run_id: Optional[str] = None) -> Dict:
+        """Enrich a lead with separate enrichment, rationale, decision maker and outreach calls
+
+        The lead is updated in place, recording each finished stage in 'completed_stages'.
+        """
+        key = self._company_key(merged)
+        enriched = merged
+        completed = enriched.setdefault('completed_stages', [])
+
+        # AI enrichment
+        enrichment = await self._stage(run_id, key, 'enrichment', lambda: self.deepseek_client.enrich_company_data(
+            dict(enriched), raise_on_error=True
+        ))
+        if enrichment is not None:
+            enriched.update(enrichment)
+            enriched['completed_stages'] = completed
+            completed.append('enrichment')
+
+        # Generate qualification rationale with AI
+        rationale = await self._stage(run_id, key, 'rationale',
+                                      lambda: self._generate_ai_rationale(enriched, raise_on_error=True))
+        if rationale:
+            enriched['qualification_rationale'] = rationale
+            completed.append('rationale')
+        else:
+            enriched['qualification_rationale'] = self._fallback_rationale(enriched)
+
+        # Identify decision makers with AI
+        decision_makers = await self._stage(run_id, key, 'decision_makers',
+                                            lambda: self.deepseek_client.identify_decision_makers(
+                                                enriched, raise_on_error=True
+                                            ))
+        enriched['decision_makers'] = decision_makers or []
+        if decision_makers:
+            completed.append('decision_makers')
+
+        # Generate contacts (this would use LinkedIn/Clay in production)
+        enriched['contacts'] = self._generate_contacts_from_decision_makers(
+            enriched['decision_makers'],
+            enriched['company_name']
+        )
+
+        # Generate personalized outreach with AI
+        if enriched.get('contacts'):
+            await self._add_outreach(enriched, industry, on_outreach_delta)
+
+        return enriched
+
+    async def _add_outreach(self, enriched: Dict, industry: str,
+                            on_outreach_delta: Optional[Callable[[Dict, str], None]] = None):
+        """Write the primary contact's outreach message into the lead, streaming it with on_outreach_delta"""
+        key = self._company_key(enriched)
+        completed = enriched.setdefault('completed_stages', [])
+        primary_contact = enriched['contacts'][0]
+        lead_data = {
+            'company_name': enriched['company_name'],
+            'contact_name': primary_contact.get('name', 'Decision Maker'),
+            'contact_title': primary_contact.get('title', ''),
+            'industry': enriched.get('industry', industry),
+            'employees': enriched.get('employees', 'Unknown'),
+            'qualification_rationale': enriched.get('qualification_rationale', '')
+        }
+        try:
+            if on_outreach_delta:
+                message = ''
+                async for message in self.deepseek_client.stream_outreach_message(lead_data, raise_on_error=True):
+                    on_outreach_delta(enriched, message)
+                enriched['outreach_message'] = message.strip()
+            else:
+                enriched['outreach_message'] = await self.deepseek_client.generate_outreach_message(
+                    lead_data, raise_on_error=True
+                )
+            if enriched['outreach_message']:
+                completed.append('outreach')
+        except Exception as e:
+            logger.error(f"Outreach failed for {key}: {str(e)}")
+            enriched['outreach_message'] = self.deepseek_client._get_fallback_message(lead_data)
+        enriched['primary_contact'] = primary_contact
+
+    def _apply_dossier(self, merged: Dict, dossier: Dict) -> Dict:
+        """Merge a one-shot lead dossier into the company data, completing only the stages it covered"""
+        enriched = dict(merged)
+        completed = list(merged.get('completed_stages', []))
+
+        if dossier.get('estimated_revenue', 0) > 0:
+            enriched['estimated_revenue'] = dossier['estimated_revenue']
+        if dossier.get('estimated_employees'):
+            enriched['estimated_employees'] = dossier['estimated_employees']
+        if dossier.get('strategic_insights'):
+            enriched['strategic_insights'] = dossier['strategic_insights']
+        if any(dossier.get(field) for field in ('estimated_revenue', 'estimated_employees', 'strategic_insights')):
+            completed.append('enrichment')
+
+        if dossier.get('qualification_rationale'):
+            enriched['qualification_rationale'] = dossier['qualification_rationale']
+            completed.append('rationale')
+        else:
+            enriched['qualification_rationale'] = self._fallback_rationale(enriched)
+
+        decision_makers = dossier.get('decision_makers', [])
+        enriched['decision_makers'] = decision_makers
+        enriched['contacts'] = self._generate_contacts_from_decision_makers(
+            decision_makers,
+            enriched['company_name']
+        )
+        if decision_makers:
+            completed.append('decision_makers')
+
+        enriched['outreach_message'] = dossier.get('outreach_message', '')
+        if enriched['contacts']:
+            enriched['primary_contact'] = enriched['contacts'][0]
+            if enriched['outreach_message']:
+                completed.append('outreach')
+
+        enriched['completed_stages'] = completed
+        return enriched
+
+    @staticmethod
+    def _fallback_rationale(company: Dict) -> str:
+        return f"{company.get('company_name', 'This company')} is a qualified lead for DuPont Tedlar."
+
+    async def _generate_ai_rationale(self, company: Dict, raise_on_error: bool = False) -> str:
+        """Generate qualification rationale using AI (the generic fallback on failure, unless raise_on_error)"""
         try:
             prompt = f"""
             Explain in 2-3 sentences why {company.get('company_name', 'this company')} is a qualified lead for DuPont Tedlar's protective films.
@@ -408,31 +805,24 @@ class RealDataLeadProcessor:
             Focus on: revenue size, industry fit, and how Tedlar's protective films (durability, UV protection, weather resistance) would benefit them.
             """
             
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.deepseek_client.client.post(
-                    "/chat/completions",
-                    json={
-                        "model": self.deepseek_client.model,
-                        "messages": [
-                            {"role": "system", "content": "You are a B2B sales analyst."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.5,
-                        "max_tokens": 300
-                    }
-                )
+            result = await self.deepseek_client.chat(
+                [
+                    {"role": "system", "content": "You are a B2B sales analyst."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.5,
+                max_tokens=300,
+                call_type="rationale",
+                company=company.get('company_name')
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                return f"{company.get('company_name', 'This company')} is a qualified lead for DuPont Tedlar."
-                
+            return result["choices"][0]["message"]["content"].strip()
+
         except Exception as e:
             logger.error(f"Error generating rationale: {str(e)}")
-            return f"{company.get('company_name', 'This company')} is a qualified lead for DuPont Tedlar."
+            if raise_on_error:
+                raise
+            return self._fallback_rationale(company)
 
     def _generate_contacts_from_decision_makers(self, decision_makers: List[Dict], company_name: str) -> List[Dict]:
         """
@@ -0,0 +1,196 @@
+"""
+Retry, backoff and circuit breaker layer for LLM calls
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and calls fail fast"""
+    pass
+
+class RetryBudgetExhausted(Exception):
+    """Raised when a pipeline run has used up its retries"""
+    pass
+
+class RetryPolicy:
+    """Jittered exponential backoff"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 20.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class RetryBudget:
+    """Caps the number of retries spent during one pipeline run"""
+
+    def __init__(self, max_retries: int = 50):
+        self.max_retries = max_retries
+        self.used = 0
+
+    def try_spend(self) -> bool:
+        if self.used >= self.max_retries:
+            return False
+        self.used += 1
+        return True
+
+    def reset(self):
+        self.used = 0
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a single probe through after a cool-down"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Metrics
+        self.trips = 0
+        self.rejected = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless the call is allowed through"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("Circuit open - DeepSeek API unavailable")
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError("Circuit half-open - waiting for probe request")
+            self._probe_in_flight = True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("Circuit breaker closed - DeepSeek API recovered")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+                logger.warning(f"Circuit breaker opened after {self.consecutive_failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Forget an in-flight probe that ended without a verdict (e.g. a client error)"""
+        self._probe_in_flight = False
+
+class ResilienceLayer:
+    """Runs calls with retries, a per-run retry budget and a circuit breaker"""
+
+    def __init__(self, retry_policy: Optional[RetryPolicy] = None, retry_budget: Optional[RetryBudget] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._default_budget = retry_budget or RetryBudget()
+        self._run_budget: ContextVar[Optional[RetryBudget]] = ContextVar(f"retry_budget_{id(self)}", default=None)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        # Metrics
+        self.calls = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self.failures = 0
+
+    async def call(self, func: Callable[[], Awaitable], is_retryable: Callable[[Exception], bool],
+                   is_breaker_failure: Optional[Callable[[Exception], bool]] = None):
+        """Await func(), retrying transient errors with jittered exponential backoff
+
+        is_breaker_failure decides which retryable errors count towards opening the
+        circuit (throttling, for example, means the provider is up).
+        """
+        self.calls += 1
+        attempt = 0
+
+        while True:
+            self.circuit_breaker.before_call()
+
+            try:
+                result = await func()
+            except Exception as e:
+                if not is_retryable(e):
+                    self.circuit_breaker.release_probe()
+                    self.failures += 1
+                    raise
+
+                if is_breaker_failure is None or is_breaker_failure(e):
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.release_probe()
+
+                if attempt + 1 >= self.retry_policy.max_attempts:
+                    self.failures += 1
+                    raise
+
+                if not self.retry_budget.try_spend():
+                    self.budget_exhausted += 1
+                    self.failures += 1
+                    raise RetryBudgetExhausted(f"Retry budget exhausted: {str(e)}") from e
+
+                delay = self.retry_policy.backoff(attempt)
+                self.retries += 1
+                attempt += 1
+                logger.warning(f"Transient LLM error ({str(e)[:100]}) - retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled: no verdict on the API, but a half-open probe must not stay claimed
+                self.circuit_breaker.release_probe()
+                raise
+
+            self.circuit_breaker.record_success()
+            return result
+
+    @property
+    def retry_budget(self) -> RetryBudget:
+        """Retry budget of the current run (see reset_budget), else the layer-wide one"""
+        return self._run_budget.get() or self._default_budget
+
+    def reset_budget(self) -> RetryBudget:
+        """Start a fresh retry budget for a new pipeline run
+
+        The budget is bound to the calling context, so concurrent runs on a shared
+        layer do not reset or drain each other's retries.
+        """
+        budget = RetryBudget(self._default_budget.max_retries)
+        self._run_budget.set(budget)
+        return budget
+
+    def stats(self) -> Dict:
+        """Return retry and circuit breaker metrics"""
+        return {
+            'calls': self.calls,
+            'retries': self.retries,
+            'failures': self.failures,
+            'retry_budget_used': self.retry_budget.used,
+            'retry_budget_exhausted': self.budget_exhausted,
+            'circuit_state': self.circuit_breaker.state,
+            'circuit_trips': self.circuit_breaker.trips,
+            'circuit_rejected': self.circuit_breaker.rejected
+        }
@@ -0,0 +1,112 @@
+"""
+Run journal for checkpointing and resuming lead generation runs
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Company key used for run-level stages (event research, discovery)
+RUN_LEVEL = "__run__"
+
+class RunJournal:
+    """SQLite journal of each company's output after each pipeline stage, keyed by run ID"""
+
+    def __init__(self, path: str = ".cache/run_journal.sqlite"):
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                industry TEXT,
+                params TEXT,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                run_id TEXT NOT NULL,
+                company_key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, company_key, stage)
+            )
+        """)
+        self.conn.commit()
+
+    def start_run(self, run_id: str, industry: str = "", params: Optional[Dict] = None) -> bool:
+        """Open a run; returns True when resuming an unfinished run with the same ID
+
+        A completed run with the same ID is cleared and started fresh.
+        """
+        now = time.time()
+        row = self.conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+
+        if row and row[0] == 'running':
+            checkpoints = self.conn.execute(
+                "SELECT COUNT(*) FROM checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchone()[0]
+            logger.info(f"Resuming run {run_id} from {checkpoints} checkpoints")
+            self.conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+            self.conn.commit()
+            return True
+
+        self.conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs (run_id, industry, params, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'running', ?, ?)",
+            (run_id, industry, json.dumps(params or {}), now, now)
+        )
+        self.conn.commit()
+        return False
+
+    def finish_run(self, run_id: str, status: str = "completed"):
+        """Mark a run as finished so the next run with this ID starts fresh"""
+        self.conn.execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (status, time.time(), run_id))
+        self.conn.commit()
+
+    def save(self, run_id: str, company_key: str, stage: str, data: Any):
+        """Persist one stage's output for a company"""
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, company_key, stage, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, company_key, stage, json.dumps(data, default=str), time.time())
+            )
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error writing run journal checkpoint {run_id}/{company_key}/{stage}: {str(e)}")
+
+    def load(self, run_id: str, company_key: str, stage: str) -> Optional[Any]:
+        """Return a saved stage output, or None if the stage has not completed"""
+        row = self.conn.execute(
+            "SELECT data FROM checkpoints WHERE run_id = ? AND company_key = ? AND stage = ?",
+            (run_id, company_key, stage)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_run(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """All checkpoints of a run as {company_key: {stage: data}}"""
+        checkpoints = {}
+        for company_key, stage, data in self.conn.execute(
+            "SELECT company_key, stage, data FROM checkpoints WHERE run_id = ?", (run_id,)
+        ):
+            checkpoints.setdefault(company_key, {})[stage] = json.loads(data)
+        return checkpoints
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.conn.close()
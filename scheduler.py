@@ -0,0 +1,135 @@
+"""
+Priority scheduler that processes the highest-value work first
+"""
+
+import asyncio
+import bisect
+import heapq
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class PriorityScheduler:
+    """Runs items through a worker pool in descending priority order
+
+    The best `top_k` finished results are published through on_top_k every time
+    they change. With stop_at_top_k the run ends as soon as the top-k is settled,
+    i.e. nothing still queued or in flight could outrank it, and the remaining
+    lower-priority work is cancelled.
+    """
+
+    def __init__(self, workers: int = 5, top_k: int = 5, stop_at_top_k: bool = False,
+                 on_top_k: Optional[Callable[[List[Any]], None]] = None):
+        self.workers = max(1, workers)
+        self.top_k = max(1, top_k)
+        self.stop_at_top_k = stop_at_top_k
+        self.on_top_k = on_top_k
+
+        self._queue: List[Tuple[float, int, Any]] = []  # heap of (-priority, seq, item)
+        self._in_flight: Dict[int, float] = {}
+        self._results: List[Tuple[float, int, Any]] = []  # (-priority, seq, result), best first
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = False
+
+        # Metrics
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    async def run(self, items: List[Tuple[float, Any]],
+                  process: Callable[[Any], Awaitable[Optional[Any]]]) -> List[Any]:
+        """Process (priority, item) pairs; returns finished results, highest priority first
+
+        process returns None for items that failed.
+        """
+        for seq, (priority, item) in enumerate(items):
+            heapq.heappush(self._queue, (-priority, seq, item))
+
+        self._tasks = [asyncio.create_task(self._worker(process)) for _ in range(self.workers)]
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        return self.results()
+
+    async def _worker(self, process: Callable[[Any], Awaitable[Optional[Any]]]):
+        while self._queue and not self._stopped:
+            negative_priority, seq, item = heapq.heappop(self._queue)
+            priority = -negative_priority
+            self._in_flight[seq] = priority
+
+            try:
+                result = await process(item)
+            except asyncio.CancelledError:
+                if self._stopped:
+                    # Lower-priority work cut off once the top-k settled
+                    self.cancelled += 1
+                    return
+                raise
+            finally:
+                self._in_flight.pop(seq, None)
+
+            if result is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._add_result(priority, seq, result)
+
+            if self.stop_at_top_k and not self._stopped and self._top_k_settled():
+                self._stop_others()
+                return
+
+    def _add_result(self, priority: float, seq: int, result: Any):
+        entry = (-priority, seq, result)
+        position = bisect.bisect_left([(p, q) for p, q, _ in self._results], entry[:2])
+        self._results.insert(position, entry)
+
+        if position < self.top_k and self.on_top_k:
+            try:
+                self.on_top_k(self.top_results())
+            except Exception as e:
+                logger.error(f"Top-k callback failed: {str(e)}")
+
+    def _top_k_settled(self) -> bool:
+        """True when the best k results can no longer be displaced"""
+        waiting = list(self._in_flight.values())
+        if self._queue:
+            waiting.append(-self._queue[0][0])
+
+        if len(self._results) < self.top_k:
+            return not waiting
+
+        kth_priority = -self._results[self.top_k - 1][0]
+        return all(priority <= kth_priority for priority in waiting)
+
+    def _stop_others(self):
+        self._stopped = True
+        logger.info(f"Top {self.top_k} settled - cancelling {len(self._in_flight)} in-flight and "
+                    f"{len(self._queue)} queued lower-priority items")
+        self.cancelled += len(self._queue)
+        self._queue.clear()
+
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+
+    def results(self) -> List[Any]:
+        """Every finished result so far, highest priority first"""
+        return [result for _, _, result in self._results]
+
+    def top_results(self) -> List[Any]:
+        """The current best k finished results"""
+        return [result for _, _, result in self._results[:self.top_k]]
+
+    def stats(self) -> Dict:
+        return {
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'stopped_early': self._stopped
+        }
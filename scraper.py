@@ -6,19 +6,98 @@ import asyncio
 import re
 import json
 import logging
-from typing import Dict, Optional, List
+from typing import Awaitable, Callable, Dict, Optional, List
 from urllib.parse import urlparse
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import aiohttp
-from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
+from multidict import CIMultiDict
 import time
+from budget import current_budget
+from crawl_scheduler import CrawlScheduler
+from http_cache import HttpCache
+from page_extractor import best_match, extract_page_facts, find_link, find_text
+from parse_executor import ParseExecutor
 
 logger = logging.getLogger(__name__)
 
+class SourceClock:
+    """Time a source has spent fetching, paused while its requests queue for a host slot"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.queued = 0
+        self.queued_since = 0.0
+        self.queued_time = 0.0
+
+    def pause(self):
+        if not self.queued:
+            self.queued_since = time.monotonic()
+        self.queued += 1
+
+    def resume(self):
+        self.queued -= 1
+        if not self.queued:
+            self.queued_time += time.monotonic() - self.queued_since
+
+    def elapsed(self) -> float:
+        queued = self.queued_time + (time.monotonic() - self.queued_since if self.queued else 0.0)
+        return time.monotonic() - self.started - queued
+
+# Clock of the source whose fetch is running in this context, if any
+_source_clock: ContextVar[Optional[SourceClock]] = ContextVar("source_clock", default=None)
+
+class ScrapeSource:
+    """A pluggable company data source: fetch(company_name, website) returns a dict of facts"""
+
+    def __init__(self, name: str, fetch: Callable[[str, str], Awaitable[Dict]], timeout: float = 15.0):
+        self.name = name
+        self.fetch = fetch
+        self.timeout = timeout
+
+        # Metrics
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_time = 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'avg_latency': round(self.total_time / self.calls, 3) if self.calls else 0.0
+        }
+
+class CachedResponse:
+    """Response served from the HTTP cache, readable like an aiohttp response"""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.body = body
+
+    @property
+    def charset(self) -> Optional[str]:
+        """Charset declared in the Content-Type header, like aiohttp's ClientResponse.charset"""
+        match = re.search(r'charset=([\w-]+)', self.headers.get('Content-Type', ''))
+        return match.group(1) if match else None
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        encoding = encoding or self.charset or 'utf-8'
+        try:
+            return self.body.decode(encoding, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
 class WebScraper:
     """Web scraper for company data extraction"""
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, http_cache: Optional[HttpCache] = None):
         self.config = config
         self.ua = UserAgent()
         self.session = None
@@ -30,29 +109,145 @@ class WebScraper:
             'Connection': 'keep-alive',
         }
         self.timeout = aiohttp.ClientTimeout(total=30)
+        self._owns_http_cache = http_cache is None
+        self.http_cache = http_cache if http_cache is not None else self._build_http_cache()
+        # HTML is parsed in worker processes; the loop only hands over raw bytes
+        self.parse_executor = ParseExecutor(config.parse_workers if config else 2)
+        self.crawl_scheduler = CrawlScheduler(
+            per_host_concurrency=config.scrape_per_host_concurrency if config else 2,
+            min_delay=config.scrape_per_host_delay if config else 1.0,
+            host_overrides=config.scrape_host_overrides if config else None
+        )
+
+        # Company data sources, fetched concurrently; later sources win on conflicting keys
+        self.sources: Dict[str, ScrapeSource] = {}
+        timeouts = config.scrape_source_timeouts if config else {}
+        available = {
+            'overview': lambda company_name, website: self._scrape_company_overview(website),
+            'linkedin': lambda company_name, website: self._scrape_linkedin(company_name),
+            'crunchbase': lambda company_name, website: self._scrape_crunchbase(company_name)
+        }
+        for name in (config.scrape_sources if config else ['overview', 'linkedin']):
+            if name in available:
+                self.register_source(name, available[name], timeouts.get(name, 15.0))
+            else:
+                logger.warning(f"Unknown scrape source '{name}' - skipping")
+
+    def register_source(self, name: str, fetch: Callable[[str, str], Awaitable[Dict]], timeout: float = 15.0):
+        """Add or replace a company data source"""
+        self.sources[name] = ScrapeSource(name, fetch, timeout)
+
+    def _build_http_cache(self) -> Optional[HttpCache]:
+        """Create the on-disk HTTP cache described by the config"""
+        if self.config and not self.config.http_cache_enabled:
+            return None
+
+        try:
+            if self.config:
+                return HttpCache(
+                    path=self.config.http_cache_path,
+                    max_size_bytes=self.config.http_cache_max_bytes,
+                    ttls=self.config.http_cache_ttls
+                )
+            return HttpCache()
+        except Exception as e:
+            logger.error(f"Could not open HTTP cache: {str(e)}")
+            return None
 
     async def _ensure_session(self):
         """Ensure aiohttp session is created"""
         if self.session is None:
-            self.session = aiohttp.ClientSession(headers=self.headers, timeout=self.timeout)
+            # The crawl scheduler paces each host; the connector caps sockets as a backstop
+            connector = aiohttp.TCPConnector(
+                limit=self.config.scrape_connection_limit if self.config else 100,
+                limit_per_host=self.crawl_scheduler.max_host_concurrency,
+                ttl_dns_cache=self.config.scrape_dns_cache_ttl if self.config else 300
+            )
+            self.session = aiohttp.ClientSession(headers=self.headers, timeout=self.timeout, connector=connector)
+
+    @asynccontextmanager
+    async def _get(self, url: str, timeout: Optional[float] = None):
+        """GET through the HTTP cache and shared session, charged to the active run budget
+
+        Fresh cache entries are served without a request. Other requests wait for a
+        slot from the per-host crawl scheduler; stale entries are revalidated with
+        their ETag / Last-Modified, and a 304 serves the cached body as a 200.
+        The request timeout is cut short so it cannot outlive the run deadline.
+        """
+        entry = self.http_cache.get(url) if self.http_cache else None
+        if entry and entry['fresh']:
+            self.http_cache.record_hit(url, entry)
+            yield CachedResponse(entry['status'], entry['headers'], entry['body'])
+            return
+
+        await self._ensure_session()
+        total = timeout or self.timeout.total
+        budget = current_budget()
+        if budget:
+            budget.charge_request()
+
+        headers = HttpCache.validators(entry) if entry else {}
+        # Waiting for the host is not charged to the source's timeout (only a cancelled wait never resumes)
+        clock = _source_clock.get()
+        if clock:
+            clock.pause()
+        async with self.crawl_scheduler.slot(url):
+            if clock:
+                clock.resume()
+            # Time spent queued for the host still counts against the run deadline
+            if budget:
+                total = budget.clamp_timeout(total)
+
+            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=total)) as response:
+                if response.status in (429, 503):
+                    self.crawl_scheduler.throttled(url, response.headers.get('Retry-After'))
+
+                if response.status == 304 and entry:
+                    self.http_cache.record_revalidated(url, entry)
+                    yield CachedResponse(entry['status'], entry['headers'], entry['body'])
+                elif response.status == 200 and self.http_cache:
+                    body = await response.read()
+                    self.http_cache.set(url, response.status, dict(response.headers), body)
+                    yield CachedResponse(response.status, dict(response.headers), body)
+                else:
+                    yield response
+
+    async def parse(self, response, func, *args):
+        """Read a response's raw bytes and run a page_extractor function on them in the parse pool"""
+        body = await response.read()
+        return await self.parse_executor.run(func, body, *args, response.charset)
+
+    def host_stats(self) -> Dict:
+        """Per-host request, queueing and back-off counters from the crawl scheduler"""
+        return self.crawl_scheduler.stats()
+
+    def http_cache_stats(self) -> Dict:
+        """HTTP cache hit, revalidation and size counters"""
+        return self.http_cache.stats() if self.http_cache else {}
 
     async def close(self):
-        """Close the aiohttp session"""
+        """Close the aiohttp session, HTTP cache and parse workers"""
         if self.session:
             await self.session.close()
+        self.parse_executor.shutdown()
+        if self.http_cache and self._owns_http_cache:
+            self.http_cache.close()
 
     async def get_company_data(self, company_name: str, website: str) -> Dict:
-        """Extract company data including revenue and employee count"""
+        """Extract company data including revenue and employee count
+
+        All registered sources are fetched concurrently, each under its own timeout,
+        so a slow or failing source costs at most its timeout (plus any wait for a
+        busy host) and never discards what the other sources found.
+        """
         try:
             await self._ensure_session()
             logger.info(f"Scraping data for {company_name} from {website}")
 
-            # Get company overview page
-            overview_data = await self._scrape_company_overview(website)
-
-            # Get additional data sources
-            linkedin_data = await self._scrape_linkedin(company_name)
-            crunchbase_data = await self._scrape_crunchbase(company_name)
+            sources = list(self.sources.values())
+            results = await asyncio.gather(*[
+                self._fetch_source(source, company_name, website) for source in sources
+            ])
 
             # Combine all data sources
             company_data = {
@@ -68,11 +263,10 @@ class WebScraper:
             }
 
             # Merge data from different sources
-            company_data.update(overview_data)
-            if linkedin_data:
-                company_data.update(linkedin_data)
-            if crunchbase_data:
-                company_data.update(crunchbase_data)
+            for source, data in zip(sources, results):
+                if data:
+                    company_data.update(data)
+                    company_data['sources'].append(source.name)
 
             return company_data
 
@@ -84,48 +278,76 @@ class WebScraper:
                 'error': str(e)
             }
 
+    async def _fetch_source(self, source: ScrapeSource, company_name: str, website: str) -> Dict:
+        """Run one source under its timeout; failures come back as an empty dict
+
+        The timeout measures time spent fetching and parsing: time its requests sit
+        queued behind other requests to a rate-limited host is not counted, so a
+        busy host slows a source down instead of timing it out.
+        """
+        budget = current_budget()
+        timeout = budget.clamp_timeout(source.timeout) if budget else source.timeout
+        source.calls += 1
+        started = time.monotonic()
+
+        clock = SourceClock()
+        token = _source_clock.set(clock)
+        try:
+            fetch = asyncio.ensure_future(source.fetch(company_name, website))
+        finally:
+            _source_clock.reset(token)
+
+        try:
+            while True:
+                remaining = timeout - clock.elapsed()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                # Re-checked after each wait, since queued time is given back
+                done, _ = await asyncio.wait({fetch}, timeout=remaining)
+                if done:
+                    return fetch.result() or {}
+        except asyncio.TimeoutError:
+            source.timeouts += 1
+            logger.warning(f"Source {source.name} timed out after {timeout:.1f}s of fetching for {company_name}")
+            return {}
+        except Exception as e:
+            source.failures += 1
+            logger.error(f"Source {source.name} failed for {company_name}: {str(e)}")
+            return {}
+        finally:
+            if not fetch.done():
+                fetch.cancel()
+                await asyncio.gather(fetch, return_exceptions=True)
+            source.total_time += time.monotonic() - started
+
+    def source_stats(self) -> Dict:
+        """Per-source call, failure and latency counters"""
+        return {name: source.stats() for name, source in self.sources.items()}
+
     async def _scrape_company_overview(self, website: str) -> Dict:
         """Scrape company overview from their website"""
+        if not website or website == 'N/A':
+            return {}
+
         try:
-            async with self.session.get(website) as response:
+            async with self._get(website) as response:
                 if response.status != 200:
                     return {}
 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
-
+                facts = await self.parse(response, extract_page_facts)
                 data = {}
 
-                # Look for revenue information
-                revenue_patterns = [
-                    r'\$\d+(?:\.\d+)?\s*(?:million|billion)?\s*(?:in\s*)?revenue',
-                    r'revenue.*?\$?\d+(?:\.\d+)?\s*(?:million|billion)',
-                    r'\d+(?:\.\d+)?\s*(?:million|billion).*(?:revenue|annual)',
-                ]
-
-                for pattern in revenue_patterns:
-                    matches = soup.find_all(text=re.compile(pattern, re.IGNORECASE))
-                    if matches:
-                        data['revenue_text'] = matches[0].strip()
-                        break
-
-                # Look for employee information
-                employee_patterns = [
-                    r'(\d+(?:,\d+)*)\s*employees?',
-                    r'employs?\s*(\d+(?:,\d+)*)',
-                    r'(\d+(?:,\d+)*)\s*people',
-                ]
-
-                for pattern in employee_patterns:
-                    matches = soup.find_all(text=re.compile(pattern, re.IGNORECASE))
-                    if matches:
-                        data['employees_text'] = matches[0].strip()
-                        break
-
-                # Extract meta description
-                meta_desc = soup.find('meta', attrs={'name': 'description'})
-                if meta_desc:
-                    data['description'] = meta_desc.get('content', '')[:500]
+                # The text node holding the best revenue / employee mention
+                revenue = best_match(facts['revenue'])
+                if revenue:
+                    data['revenue_text'] = revenue['text']
+
+                employees = best_match(facts['employees'])
+                if employees:
+                    data['employees_text'] = employees['text']
+
+                if facts['description']:
+                    data['description'] = facts['description']
 
                 return data
 
@@ -139,19 +361,17 @@ class WebScraper:
             # This would be integrated with LinkedIn Sales Navigator API
             linkedin_url = f"https://www.linkedin.com/company/{company_name.lower().replace(' ', '-')}"
 
-            async with self.session.get(linkedin_url) as response:
+            async with self._get(linkedin_url) as response:
                 if response.status != 200:
                     return {}
 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
-
+                facts = await self.parse(response, extract_page_facts)
                 data = {}
 
-                # Simplified extraction for company size and industry
-                size_match = soup.find(text=re.compile(r'(\d+(?:,\d+)*)\s*employees?', re.IGNORECASE))
+                # Simplified extraction for company size ("N employees" only)
+                size_match = best_match(facts['employees'], patterns=[0])
                 if size_match:
-                    data['employees_linkedin'] = size_match.strip()
+                    data['employees_linkedin'] = size_match['text']
 
                 return data
 
@@ -159,44 +379,36 @@ class WebScraper:
             logger.error(f"Error scraping LinkedIn for {company_name}: {str(e)}")
             return {}
 
-    '''
     async def _scrape_crunchbase(self, company_name: str) -> Dict:
         """Scrape Crunchbase company data"""
         try:
             # Crunchbase search URL
             search_url = f"https://www.crunchbase.com/search/organizations/field/organizations/name/{company_name.replace(' ', '-')}"
 
-            async with self.session.get(search_url) as response:
+            async with self._get(search_url) as response:
                 if response.status != 200:
                     return {}
 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
-
-                data = {}
-
                 # Extract company profile link
-                company_link = soup.find('a', href=re.compile(r'/organization/[^/]+$'))
-                if company_link:
-                    profile_url = f"https://www.crunchbase.com{company_link['href']}"
+                profile_path = await self.parse(response, find_link, r'/organization/[^/]+$')
 
-                    # Get the actual company profile
-                    async with self.session.get(profile_url) as profile_response:
-                        if profile_response.status == 200:
-                            profile_html = await profile_response.text()
-                            profile_soup = BeautifulSoup(profile_html, 'lxml')
+            data = {}
+            if profile_path:
+                profile_url = f"https://www.crunchbase.com{profile_path}"
 
-                            # Extract financial information
-                            funding_info = profile_soup.find(text=re.compile(r'revenue|funding|valuation', re.IGNORECASE))
-                            if funding_info:
-                                data['financial_info'] = funding_info.strip()[:200]
+                # Get the actual company profile once the search request has released its host slot
+                async with self._get(profile_url) as profile_response:
+                    if profile_response.status == 200:
+                        # Extract financial information
+                        funding_info = await self.parse(profile_response, find_text, r'revenue|funding|valuation')
+                        if funding_info:
+                            data['financial_info'] = funding_info[:200]
 
-                return data
+            return data
 
         except Exception as e:
             logger.error(f"Error scraping Crunchbase for {company_name}: {str(e)}")
             return {}
-    '''
 
     def _parse_revenue(self, revenue_text: str) -> Optional[float]:
         """Parse revenue text into numeric value"""
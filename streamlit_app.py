@@ -18,6 +18,7 @@ from deepseek_client import DeepSeekClient
 from real_data_processor import RealDataLeadProcessor
 from dashboard import DashboardGenerator
 from validation import validate_leads_batch
+from config import Config
 
 # Page configuration
 st.set_page_config(
@@ -149,6 +150,8 @@ if 'dashboard_data' not in st.session_state:
     st.session_state.dashboard_data = None
 if 'processing' not in st.session_state:
     st.session_state.processing = False
+if 'run_stats' not in st.session_state:
+    st.session_state.run_stats = None
 
 # Header
 st.markdown('<div class="main-header">Lead Generation AI Agent</div>', unsafe_allow_html=True)
@@ -191,6 +194,29 @@ with st.sidebar:
         help="Uses AI and web scraping (slower, uses API calls)"
     )
     
+    stop_at_top_k = st.checkbox(
+        "Stop when top leads are ready",
+        value=False,
+        help="Return as soon as the highest-value leads are complete instead of waiting for the rest"
+    )
+    
+    top_k = st.number_input(
+        "Top leads to wait for",
+        min_value=1,
+        max_value=20,
+        value=min(5, max_leads),
+        disabled=not stop_at_top_k
+    )
+    
+    time_budget = st.number_input(
+        "Time limit (seconds)",
+        min_value=0,
+        max_value=3600,
+        value=0,
+        step=30,
+        help="Return the leads finished so far when time runs out (0 = no limit)"
+    )
+    
     st.markdown("---")
     
     # Generate button
@@ -230,15 +256,19 @@ if generate_button:
             status_text.text("Initializing components...")
             progress_bar.progress(10)
             
-            scraper = WebScraper()
-            deepseek_client = DeepSeekClient(api_key)
+            config = Config()
+            scraper = WebScraper(config)
+            deepseek_client = DeepSeekClient(api_key, config=config)
+            deepseek_client.start_run()
             
             if use_real_data:
                 # Use real data processor
                 status_text.text("Researching industry events with AI...")
                 progress_bar.progress(20)
                 
-                processor = RealDataLeadProcessor(scraper, deepseek_client)
+                config.lead_top_k = int(top_k)
+                config.run_deadline_seconds = int(time_budget)
+                processor = RealDataLeadProcessor(scraper, deepseek_client, config)
                 
                 status_text.text("🏢 Identifying companies with AI...")
                 progress_bar.progress(40)
@@ -249,7 +279,59 @@ if generate_button:
                 status_text.text("Enriching with AI analysis...")
                 progress_bar.progress(80)
                 
-                leads = await processor.generate_real_leads(industry, max_results=max_leads)
+                # Render each outreach draft as it streams in
+                live_container = st.container()
+                live_drafts = {}
+                
+                def show_outreach_delta(lead, text):
+                    name = lead.get('company_name', 'Unknown')
+                    if name not in live_drafts:
+                        with live_container:
+                            st.markdown(f"**{name}**")
+                            live_drafts[name] = {'slot': st.empty(), 'index': len(live_drafts), 'updates': 0}
+                    draft = live_drafts[name]
+                    draft['updates'] += 1
+                    draft['slot'].text_area(
+                        f"Outreach draft for {name}",
+                        text,
+                        height=200,
+                        key=f"live_outreach_{draft['index']}_{draft['updates']}",
+                        label_visibility="collapsed"
+                    )
+                
+                def show_completed_lead(lead):
+                    status_text.text(f"Completed lead: {lead.get('company_name', 'Unknown')}")
+                
+                # Best leads so far, refreshed whenever the top-k changes
+                top_leads_slot = st.empty()
+                
+                def show_top_leads(top_leads):
+                    top_leads_slot.dataframe(pd.DataFrame([
+                        {
+                            'Company': lead.get('company_name', 'Unknown'),
+                            'Revenue ($M)': round(lead.get('estimated_revenue', 0) / 1000000),
+                            'Events': ', '.join(lead.get('events_attending', []))
+                        }
+                        for lead in top_leads
+                    ]), use_container_width=True)
+                
+                # Same settings on the same day share a run ID, so a run interrupted
+                # by a restart picks up from its journalled checkpoints
+                run_id = f"{industry.strip().lower()}|{max_leads}|{datetime.now():%Y-%m-%d}"
+                
+                leads = await processor.generate_real_leads(
+                    industry,
+                    max_results=max_leads,
+                    on_outreach_delta=show_outreach_delta,
+                    on_lead=show_completed_lead,
+                    run_id=run_id,
+                    on_top_k=show_top_leads,
+                    stop_at_top_k=stop_at_top_k
+                )
+                
+                partial = [lead for lead in leads if lead.get('completeness', 1) < 1]
+                if partial:
+                    st.warning(f"Time limit reached - {len(partial)} of {len(leads)} leads are only partially enriched")
             else:
                 # testing mode with sample data
                 from lead_processor import LeadProcessor
@@ -333,18 +415,21 @@ if generate_button:
             validated_leads = validate_leads_batch(leads)
             
             # Generate dashboard data
+            run_stats = deepseek_client.usage.summary()
             dashboard_gen = DashboardGenerator()
-            dashboard_data = dashboard_gen.create_dashboard(validated_leads)
+            dashboard_data = dashboard_gen.create_dashboard(validated_leads, run_stats=run_stats)
             
             # Store in session state
             st.session_state.leads = validated_leads
             st.session_state.dashboard_data = dashboard_data
+            st.session_state.run_stats = run_stats
             
             progress_bar.progress(100)
             status_text.text("Lead generation complete!")
             
             # Cleanup
             await scraper.close()
+            await deepseek_client.close()
             
             return True
             
@@ -515,7 +600,7 @@ if st.session_state.leads and st.session_state.dashboard_data:
     st.markdown("---")
     
     # Tabs for analytics and export
-    tab1, tab2 = st.tabs(["Analytics", "Export Data"])
+    tab1, tab2, tab3 = st.tabs(["Analytics", "Export Data", "Run Stats"])
     
     with tab1:
         st.header("Analytics")
@@ -576,8 +661,38 @@ if st.session_state.leads and st.session_state.dashboard_data:
                 if st.button("Generate Excel", use_container_width=True):
                     dashboard_gen = DashboardGenerator()
                     excel_file = f"leads_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-                    dashboard_gen.export_to_excel(st.session_state.leads, excel_file)
+                    dashboard_gen.export_to_excel(st.session_state.leads, excel_file, run_stats=st.session_state.run_stats)
                     st.success(f"Excel file generated: {excel_file}")
+    
+    with tab3:
+        st.header("Run Stats")
+        
+        run_stats = st.session_state.dashboard_data.get('run_stats', {})
+        
+        if run_stats:
+            totals = run_stats.get('totals', {})
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Wall Clock", f"{run_stats.get('wall_clock', 0):.1f}s")
+            with col2:
+                st.metric("LLM Calls", f"{totals.get('api_calls', 0)} / {totals.get('calls', 0)}", help="API calls / total (incl. cache hits and coalesced)")
+            with col3:
+                st.metric("Total Tokens", f"{totals.get('total_tokens', 0):,}")
+            with col4:
+                st.metric("Estimated Cost", f"${totals.get('estimated_cost', 0):.4f}")
+            
+            st.subheader("By Stage")
+            df_stages = pd.DataFrame(run_stats.get('stages', []))
+            if not df_stages.empty:
+                st.dataframe(df_stages.set_index('stage'), use_container_width=True)
+                st.bar_chart(df_stages.set_index('stage')['latency_total'])
+            
+            if run_stats.get('top_companies'):
+                st.subheader("Most Expensive Companies")
+                st.dataframe(pd.DataFrame(run_stats['top_companies']).set_index('company'), use_container_width=True)
+        else:
+            st.info("No LLM usage recorded for this run")
 
 else:
     # Welcome screen
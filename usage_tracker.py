@@ -0,0 +1,86 @@
+"""
+Token usage, latency and cost accounting for LLM calls
+"""
+
+import math
+import time
+from typing import Dict, List, Optional
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+class UsageTracker:
+    """Records every chat call of a pipeline run, tagged by stage and company"""
+
+    def __init__(self, prompt_price_per_million: float = 0.30, completion_price_per_million: float = 1.20):
+        self.prompt_price_per_million = prompt_price_per_million
+        self.completion_price_per_million = completion_price_per_million
+        self.started_at = time.time()
+        self.records: List[Dict] = []
+
+    def record(self, stage: str, company: Optional[str] = None, usage: Optional[Dict] = None,
+               latency: float = 0.0, source: str = "api", error: Optional[str] = None):
+        """Record one call; source is "api", "cache" or "coalesced" """
+        usage = usage or {}
+        prompt_tokens = usage.get('prompt_tokens', 0) or 0
+        completion_tokens = usage.get('completion_tokens', 0) or 0
+
+        self.records.append({
+            'stage': stage,
+            'company': company or '',
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'latency': latency,
+            'source': source,
+            'error': error,
+            'cost': self._cost(prompt_tokens, completion_tokens)
+        })
+
+    def _cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.prompt_price_per_million +
+                completion_tokens * self.completion_price_per_million) / 1000000
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(r['prompt_tokens'] + r['completion_tokens'] for r in self.records)
+
+    def _aggregate(self, records: List[Dict]) -> Dict:
+        latencies = [r['latency'] for r in records if r['source'] == 'api']
+        prompt_tokens = sum(r['prompt_tokens'] for r in records)
+        completion_tokens = sum(r['completion_tokens'] for r in records)
+
+        return {
+            'calls': len(records),
+            'api_calls': sum(1 for r in records if r['source'] == 'api'),
+            'cache_hits': sum(1 for r in records if r['source'] == 'cache'),
+            'coalesced': sum(1 for r in records if r['source'] == 'coalesced'),
+            'errors': sum(1 for r in records if r['error']),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'latency_p50': round(percentile(latencies, 50), 3),
+            'latency_p95': round(percentile(latencies, 95), 3),
+            'latency_total': round(sum(latencies), 3),
+            'estimated_cost': round(sum(r['cost'] for r in records), 6)
+        }
+
+    def summary(self) -> Dict:
+        """Aggregate the run per stage, per company and overall"""
+        stages = {}
+        companies = {}
+        for record in self.records:
+            stages.setdefault(record['stage'], []).append(record)
+            if record['company']:
+                companies.setdefault(record['company'], []).append(record)
+
+        return {
+            'totals': self._aggregate(self.records),
+            'stages': {stage: self._aggregate(records) for stage, records in stages.items()},
+            'companies': {company: self._aggregate(records) for company, records in companies.items()},
+            'wall_clock': round(time.time() - self.started_at, 2)
+        }
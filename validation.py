@@ -9,6 +9,18 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Legal-form suffixes that don't add value to a company name
+COMPANY_SUFFIX_PATTERNS = [
+    r'\s+Ltd\.?$',
+    r'\s+LLC\.?$',
+    r'\s+Inc\.?$',
+    r'\s+Corp\.?$',
+    r'\s+Corporation\.?$',
+    r'\s+Limited\.?$',
+    r'\s+Co\.?$',
+    r'\s+Company\.?$'
+]
+
 class LeadValidationError(Exception):
     """Custom exception for lead validation errors"""
     pass
@@ -79,18 +91,7 @@ class CompanyDataValidator:
         name = re.sub(r'\s+', ' ', name.strip())
 
         # Remove common suffixes that don't add value
-        suffixes_to_remove = [
-            r'\s+Ltd\.?$',
-            r'\s+LLC\.?$',
-            r'\s+Inc\.?$',
-            r'\s+Corp\.?$',
-            r'\s+Corporation\.?$',
-            r'\s+Limited\.?$',
-            r'\s+Co\.?$',
-            r'\s+Company\.?$'
-        ]
-
-        for suffix in suffixes_to_remove:
+        for suffix in COMPANY_SUFFIX_PATTERNS:
             name = re.sub(suffix, '', name, flags=re.IGNORECASE)
 
         return name.strip()
@@ -168,6 +169,64 @@ class ContactDataValidator:
 
         return ' '.join(capitalized_parts)
 
+class LeadQualificationGate:
+    """Cheap qualification of discovered companies before any scraping or enrichment"""
+
+    def __init__(self, config=None):
+        self.min_revenue = config.min_revenue_threshold if config else 100000000
+        self.min_employees = config.min_employee_count if config else 0
+        self.qualifying_keywords = [k.lower() for k in (config.qualifying_keywords if config else [])]
+        self.excluded_keywords = [k.lower() for k in (config.excluded_keywords if config else [])]
+
+        # Rejections per reason
+        self.passed = 0
+        self.rejected: Dict[str, int] = {}
+
+    def rejection_reason(self, company: Dict) -> Optional[str]:
+        """Return why a company fails the gate, or None if it qualifies
+
+        Missing revenue fails; a missing employee count does not.
+        """
+        revenue = company.get('estimated_revenue', 0)
+        if not isinstance(revenue, (int, float)) or revenue < self.min_revenue:
+            return 'revenue'
+
+        employees = company.get('employees')
+        if self.min_employees and isinstance(employees, int) and employees < self.min_employees:
+            return 'employees'
+
+        text = ' '.join([
+            company.get('name', ''),
+            company.get('products', ''),
+            company.get('industry', '')
+        ]).lower()
+
+        if any(keyword in text for keyword in self.excluded_keywords):
+            return 'excluded_keyword'
+
+        if self.qualifying_keywords and not any(keyword in text for keyword in self.qualifying_keywords):
+            return 'industry'
+
+        return None
+
+    def qualifies(self, company: Dict) -> bool:
+        """Check one company and count the outcome"""
+        reason = self.rejection_reason(company)
+        if reason:
+            self.rejected[reason] = self.rejected.get(reason, 0) + 1
+            logger.info(f"Pre-filter dropped {company.get('name', 'Unknown')}: {reason}")
+            return False
+
+        self.passed += 1
+        return True
+
+    def filter(self, companies: List[Dict]) -> List[Dict]:
+        """Keep only the companies that pass the gate"""
+        return [company for company in companies if self.qualifies(company)]
+
+    def stats(self) -> Dict:
+        return {'passed': self.passed, 'rejected': dict(self.rejected)}
+
 class ErrorHandler:
     """Central error handling and recovery"""
 